@@ -9,6 +9,7 @@ Supports file uploads and text-based extraction with various configuration optio
 from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 import os
+import sys
 import tempfile
 import json
 import logging
@@ -18,8 +19,11 @@ import traceback
 
 # Import our extraction system
 from scripts.configurable_extractor import ConfigurableMetadataExtractor, extract_all_metadata
-from scripts.metadata_extractor import extract_text_from_pdf, extract_text_from_pdf_with_pdfplumber, extract_text_from_pdf_with_ocr
 from scripts.legal_document_extractor import LegalDocumentExtractor, extract_legal_metadata
+from scripts.document_classifier import classify_text, classify_pdf
+# page_quality imports its sibling modules (lexicon) by plain name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from scripts.page_quality import extract_pages
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -48,18 +52,22 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_file(file_path):
-    """Extract text from various file types"""
+def extract_text_from_file(file_path, provenance=None):
+    """Extract text from various file types
+
+    For PDFs, each page comes from its cheapest adequate backend (fitz,
+    pdfplumber, OCR); pass a list as `provenance` to receive the per-page map.
+    """
     ext = os.path.splitext(file_path)[1].lower()
     
     if ext == '.pdf':
-        # Try multiple extraction methods
-        text = extract_text_from_pdf(file_path)
-        if not text.strip():
-            text = extract_text_from_pdf_with_pdfplumber(file_path)
-        if not text.strip():
-            text = extract_text_from_pdf_with_ocr(file_path)
-        return text
+        extracted = extract_pages(file_path)
+        if provenance is not None:
+            provenance.extend(extracted['provenance'])
+        ocr_pages = [p['page'] for p in extracted['provenance'] if p['source'] == 'ocr']
+        if ocr_pages:
+            logger.info(f"OCR used for pages {ocr_pages} of {file_path}")
+        return '\n\n'.join(extracted['pages'])
     elif ext == '.txt':
         try:
             with open(file_path, encoding='utf-8') as f:
@@ -153,6 +161,60 @@ def extract_text_from_file(file_path):
 #         logger.error(traceback.format_exc())
 #         return jsonify({'error': str(e)}), 500
 
+@app.route('/detect', methods=['POST'])
+def detect_document_type():
+    """
+    Detect the document type from the first page only
+    
+    Request (Form Data):
+    - file: Uploaded document file (optional)
+    - text: Text content (optional, if no file)
+    
+    Request (JSON):
+    - text: Text content
+    
+    Returns:
+    - JSON with the document type, confidence and the extraction route to use
+    """
+    try:
+        if request.is_json:
+            data = request.get_json()
+            text = data.get('text') if data else None
+            if not text:
+                return jsonify({'error': 'No text provided in JSON'}), 400
+            return jsonify(classify_text(text))
+        
+        if 'file' in request.files:
+            file = request.files['file']
+            if file.filename == '':
+                return jsonify({'error': 'No file selected'}), 400
+            
+            if not allowed_file(file.filename):
+                return jsonify({'error': 'File type not allowed'}), 400
+            
+            filename = secure_filename(file.filename)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{timestamp}_{filename}")
+            file.save(file_path)
+            try:
+                if file_path.lower().endswith('.pdf'):
+                    result = classify_pdf(file_path)
+                else:
+                    result = classify_text(extract_text_from_file(file_path))
+            finally:
+                os.remove(file_path)
+            return jsonify(result)
+        
+        if 'text' in request.form:
+            return jsonify(classify_text(request.form['text']))
+        
+        return jsonify({'error': 'No file or text provided'}), 400
+        
+    except Exception as e:
+        logger.error(f"Error in detect_document_type endpoint: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error"""
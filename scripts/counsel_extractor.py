@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Rule-Based Counsel Extractor
+============================
+
+Fills doubleCouncilDetailRequest without calling the LLM. Recognises the
+appearance forms used in Indian judgments:
+
+- Label first:  "For Petitioner(s): Mr. X, Adv.", "Counsel for Respondent : A, B"
+- Name first:   "Mr. X, Senior Advocate with Mr. Y, Advocate for the Petitioner."
+                "Mr. X, learned AGA for the State."
+
+Only the appearance segment is scanned: the CORAM/appearance block on the
+first pages, from the first counsel entry up to the start of the judgment
+body (the JUDGMENT/ORDER heading, "Hon'ble ..., J." or "Heard ...").
+
+Usage:
+    python counsel_extractor.py <file.pdf> [...]
+    python counsel_extractor.py --benchmark <file.pdf> [...]
+"""
+
+import sys
+import re
+import json
+import time
+from typing import Dict, List, Tuple
+
+# Appearances are listed on the first pages only
+MAX_PAGES = 2
+MAX_SEGMENT_CHARS = 3000
+
+APPELLANT_ROLES = ('petitioner', 'appellant', 'applicant', 'plaintiff', 'complainant', 'revisionist')
+
+_ROLE = r'(?P<role>petitioner|appellant|applicant|plaintiff|complainant|revisionist|respondent|defendant|opposite\s+part(?:y|ies)|state)'
+_ROLE_TAIL = r'(?:s|\(s\))?(?:\s+nos?\.?\s*\d+(?:\s*(?:,|&|and|to)\s*\d+)*)?'
+
+# "For the Petitioner :", "Counsel for Respondent -"
+LABEL_RE = re.compile(
+    rf'(?:counsel\s+|advocates?\s+)?\bfor\s+(?:the\s+)?{_ROLE}{_ROLE_TAIL}\s*[:\-–]+',
+    re.IGNORECASE
+)
+
+# "... Advocate for the Petitioner", "... learned counsel for respondent no.2"
+SUFFIX_RE = re.compile(
+    rf'\b(?:for|on\s+behalf\s+of)\s+(?:the\s+)?{_ROLE}{_ROLE_TAIL}\b\.?',
+    re.IGNORECASE
+)
+
+# Where the appearance block ends and the judgment body begins
+BODY_START_RE = re.compile(
+    r'^\s*(?:COMMON\s+)?(?:J\s*U\s*D\s*G\s*E?\s*M\s*E\s*N\s*T|O\s*R\s*D\s*E\s*R)\s*(?:[:(]|$)'
+    r'|HON\'?BLE\b[^\n]*?,?\s*J\.'
+    r'|^\s*Heard\b'
+    r'|^\s*UPON\s+hearing\b',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Blank line or a line ending in "." / ":" starts a new appearance entry
+ENTRY_BOUNDARY_RE = re.compile(r'\n[ \t]*\n|[.:][ \t]*\n')
+
+# A new honorific also starts a new name ("..., AOR Mr. Ravi Kumar, Adv.")
+HONORIFIC_START_RE = re.compile(r'\s+(?=(?:Mr|Ms|Mrs|Miss|Sri|Shri|Smt|Dr)\.?\s)')
+HONORIFIC_RE = re.compile(r'^(?:(?:Mr|Ms|Mrs|Miss|Sri|Shri|Smt|Kumari|Dr)\.?\s+)+', re.IGNORECASE)
+NAME_SPLIT_RE = re.compile(r'\s*(?:,|;|&|\bwith\b|\bassisted\s+by\b|\band\b|\balong\s+with\b)\s*', re.IGNORECASE)
+DESIGNATION_RE = re.compile(
+    r'\b(?:learned|ld\.|senior|sr\.|additional|addl\.|deputy|dy\.|assistant|asstt?\.|government|govt\.|'
+    r'public|standing|central|chief|special|panel|amicus\s+curiae|advocates?|adv\.?|counsels?|'
+    r'prosecutors?|pleaders?|general|solicitor|a\.?o\.?r\.?|a\.?g\.?a\.?|a\.?p\.?p\.?|g\.?p\.?|a\.?g\.?p\.?)\b\.?',
+    re.IGNORECASE
+)
+LEADING_NOISE_RE = re.compile(r'^(?:presence|present|appearance|coram)\s*:\s*', re.IGNORECASE)
+
+
+def _side(role: str) -> str:
+    """Map a role word to the appellant or respondent side."""
+    role = role.lower()
+    return 'appellant' if role.startswith(APPELLANT_ROLES) else 'respondent'
+
+
+def _split_names(entry: str) -> Tuple[List[str], bool]:
+    """Split an appearance entry into counsel names.
+
+    Returns the names and whether any of them carried an honorific
+    (Mr./Ms./Sri ...), which makes the entry more trustworthy.
+    """
+    entry = LEADING_NOISE_RE.sub('', ' '.join(entry.split()))
+    entry = HONORIFIC_START_RE.sub(', ', entry)
+    names = []
+    has_honorific = False
+    for piece in NAME_SPLIT_RE.split(entry):
+        if HONORIFIC_RE.match(piece):
+            has_honorific = True
+            piece = HONORIFIC_RE.sub('', piece)
+        # Designations such as "Senior Advocate" or "learned AGA" are not names
+        remainder = DESIGNATION_RE.sub('', piece)
+        if not re.search(r'[A-Za-z]', remainder):
+            continue
+        # Keep abbreviations like "C.S.C." intact, only trim separators around the name
+        name = ' '.join(piece.split()).strip(' ,;:-')
+        name = re.sub(r'(?:\s*,?\s*\b(?:learned\s+)?(?:senior\s+|sr\.\s+)?(?:advocates?|adv\.?|counsel)\b\.?)+$', '',
+                      name, flags=re.IGNORECASE).strip(' ,;:-')
+        if name and name[0].isupper() and name not in names:
+            names.append(name)
+    return names, has_honorific
+
+
+def appearance_segment(pages: List[str], max_pages: int = MAX_PAGES) -> str:
+    """Return the appearance block: first counsel entry up to the judgment body."""
+    text = '\n'.join(pages[:max_pages])
+    first = None
+    for regex in (LABEL_RE, SUFFIX_RE):
+        match = regex.search(text)
+        if match and (first is None or match.start() < first.start()):
+            first = match
+    if first is None:
+        return ''
+
+    # Walk back to the start of the entry that owns the first anchor
+    boundaries = [m.end() for m in ENTRY_BOUNDARY_RE.finditer(text, 0, first.start())]
+    start = boundaries[-1] if boundaries else 0
+
+    body = BODY_START_RE.search(text, first.end())
+    end = body.start() if body else len(text)
+    return text[start:min(end, start + MAX_SEGMENT_CHARS)]
+
+
+def extract_counsel(pages: List[str]) -> Dict:
+    """Extract advocates for both sides from the appearance segment.
+
+    Returns advocateForAppellant / advocateForRespondent ("none" when not
+    found) and a confidence between 0 and 1.
+    """
+    segment = appearance_segment(pages)
+    found = {'appellant': [], 'respondent': []}
+    scores = {'appellant': 0.0, 'respondent': 0.0}
+
+    def add(role: str, names: List[str], score: float):
+        side = _side(role)
+        for name in names:
+            if name not in found[side]:
+                found[side].append(name)
+        if names:
+            scores[side] = max(scores[side], score)
+
+    # Label-first entries own the text up to the next label
+    labels = list(LABEL_RE.finditer(segment))
+    consumed = []
+    for i, label in enumerate(labels):
+        end = labels[i + 1].start() if i + 1 < len(labels) else len(segment)
+        names, has_honorific = _split_names(segment[label.end():end])
+        add(label.group('role'), names, 0.9 if has_honorific else 0.8)
+        consumed.append((label.start(), end))
+
+    # Name-first entries run from the previous entry boundary to the anchor
+    previous_end = 0
+    for anchor in SUFFIX_RE.finditer(segment):
+        if any(start <= anchor.start() < end for start, end in consumed):
+            continue
+        boundaries = [m.end() for m in ENTRY_BOUNDARY_RE.finditer(segment, previous_end, anchor.start())]
+        entry_start = max([previous_end] + boundaries)
+        names, has_honorific = _split_names(segment[entry_start:anchor.start()])
+        add(anchor.group('role'), names, 0.85 if has_honorific else 0.6)
+        previous_end = anchor.end()
+
+    return {
+        'advocateForAppellant': ', '.join(found['appellant']) or 'none',
+        'advocateForRespondent': ', '.join(found['respondent']) or 'none',
+        'confidence': round((scores['appellant'] + scores['respondent']) / 2, 2),
+    }
+
+
+def _read_pdf_pages(pdf_path: str, max_pages: int = MAX_PAGES) -> List[str]:
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        return [doc[i].get_text() for i in range(min(max_pages, len(doc)))]
+
+
+def benchmark(pdf_paths: List[str], rounds: int = 50) -> Dict:
+    """Time extraction on sample PDFs (page reading excluded) and report results."""
+    report = {}
+    for pdf_path in pdf_paths:
+        read_start = time.perf_counter()
+        pages = _read_pdf_pages(pdf_path)
+        read_ms = (time.perf_counter() - read_start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            result = extract_counsel(pages)
+        report[pdf_path] = {
+            'result': result,
+            'page_read_ms': round(read_ms, 3),
+            'extract_ms': round((time.perf_counter() - start) * 1000 / rounds, 3),
+        }
+    return report
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python counsel_extractor.py [--benchmark] <file.pdf> [...]", file=sys.stderr)
+        sys.exit(1)
+    if args[0] == '--benchmark':
+        print(json.dumps(benchmark(args[1:]), ensure_ascii=False, indent=2))
+        return
+    results = {path: extract_counsel(_read_pdf_pages(path)) for path in args}
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Deterministic Decision-Date Extractor
+=====================================
+
+Finds the date a judgment/order was decided without calling the LLM.
+
+1. Every date candidate is collected in one pass over the text:
+   "31.01.2021", "31/01/21", "31st January, 2021", "January 31, 2021", "1st JULY 2025"
+2. Anchoring phrases ("delivered on", "Pronounced on", "Dated:", "Order Date :",
+   "Reserved on", "order dated ...") are assigned to the dates that follow them.
+   Stacked labels ("Reserved on :\\nPronounced on:\\n1st JULY\\n7th JULY") are
+   assigned in order.
+3. Each candidate gets a feature row (anchor, position in the document, date on a
+   line of its own, latest date in the document) and all rows are scored in one
+   matrix product.
+
+The best candidate is accepted only when its score reaches SCORE_THRESHOLD;
+below that the caller should rely on the LLM's decided_date instead.
+"""
+
+import sys
+import re
+import json
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH_NAME = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|'
+               r'sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+
+DATE_RE = re.compile(
+    r'(?<![\d.:/-])(?P<d1>\d{1,2})\s*[./-]\s*(?P<m1>\d{1,2})\s*[./-]\s*(?P<y1>\d{4}|\d{2})(?![\d.:/-]*\d)'
+    rf'|\b(?P<d2>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:day\s+of\s+)?(?P<m2>{_MONTH_NAME})\.?,?\s+(?P<y2>\d{{4}})\b'
+    rf'|\b(?P<m3>{_MONTH_NAME})\.?\s+(?P<d3>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<y3>\d{{4}})\b',
+    re.IGNORECASE
+)
+
+# Anchors: phrase -> weight. Positive anchors mark the decision date, negative
+# ones mark other dates (hearing, reserving, earlier orders).
+ANCHORS = [
+    (r'(?:judg(?:e)?ment|order)\s+(?:delivered|pronounced|decided|passed)\s+on', 4.0),
+    (r'(?:delivered|pronounced|decided)\s+on', 3.5),
+    (r'date\s+of\s+(?:decision|judg(?:e)?ment|order|pronouncement)', 3.5),
+    (r'(?:order|judg(?:e)?ment)\s+date', 3.5),
+    (r'^\s*dated?\s*[:\-]', 2.5),
+    (r'(?:judg(?:e)?ment|order)\s+reserved\s+on|reserved\s+on|(?:heard|argued)\s+on|date\s+of\s+hearing', -3.0),
+    (r'(?:uploaded|downloaded|printed)\s+on', -3.0),
+    (r'(?:order|judg(?:e)?ment|award|notice|letter|report)\s+dated|\bdated', -1.0),
+]
+ANCHOR_RE = re.compile('|'.join(f'(?P<a{i}>{pattern})' for i, (pattern, _) in enumerate(ANCHORS)),
+                       re.IGNORECASE | re.MULTILINE)
+ANCHOR_WEIGHTS = [weight for _, weight in ANCHORS]
+# An anchor only applies to dates that follow it closely
+ANCHOR_REACH = 120
+
+# Feature columns: anchor weight, in header band, in final part, alone on its
+# line, latest date in the document
+FEATURE_WEIGHTS = np.array([1.0, 0.5, 1.5, 1.0, 1.0])
+HEADER_CHARS = 3000
+FINAL_PART = 0.1
+SCORE_THRESHOLD = 3.0
+
+
+def _parse_candidate(match: re.Match) -> Optional[date]:
+    """Turn a DATE_RE match into a date, or None if it is not a real date."""
+    groups = match.groupdict()
+    for i in ('1', '2', '3'):
+        if groups[f'y{i}']:
+            day, month, year = groups[f'd{i}'], groups[f'm{i}'], groups[f'y{i}']
+            break
+    month = int(month) if month.isdigit() else MONTHS[month[:3].lower()]
+    year = int(year)
+    if year < 100:
+        year += 2000 if year <= date.today().year % 100 else 1900
+    if not 1950 <= year <= date.today().year + 1:
+        return None
+    try:
+        return date(year, month, int(day))
+    except ValueError:
+        return None
+
+
+def find_date_candidates(text: str) -> List[Dict]:
+    """Collect every date in the text with the anchor that governs it."""
+    events = []
+    for match in ANCHOR_RE.finditer(text):
+        index = int(match.lastgroup[1:])
+        events.append((match.start(), match.end(), 'anchor', ANCHOR_WEIGHTS[index], match.group(0)))
+    for match in DATE_RE.finditer(text):
+        parsed = _parse_candidate(match)
+        if parsed:
+            events.append((match.start(), match.end(), 'date', parsed, match.group(0)))
+    events.sort(key=lambda e: e[0])
+
+    candidates = []
+    pending = []  # anchors waiting for their date, oldest first
+    for start, end, kind, value, raw in events:
+        if kind == 'anchor':
+            pending.append((end, value, raw))
+            continue
+        pending = [a for a in pending if start - a[0] <= ANCHOR_REACH]
+        anchor_weight, anchor_text = 0.0, None
+        if pending:
+            _, anchor_weight, anchor_text = pending.pop(0)
+        line_start = text.rfind('\n', 0, start) + 1
+        line_end = text.find('\n', end)
+        line = text[line_start:line_end if line_end != -1 else len(text)]
+        candidates.append({
+            'date': value,
+            'raw': raw,
+            'position': start,
+            'anchor': anchor_text,
+            'anchor_weight': anchor_weight,
+            'own_line': line.strip(' .,:') == raw.strip(' .,:'),
+        })
+    return candidates
+
+
+def score_candidates(candidates: List[Dict], text_length: int) -> np.ndarray:
+    """Score all candidates at once from their feature matrix."""
+    if not candidates:
+        return np.zeros(0)
+    positions = np.array([c['position'] for c in candidates], dtype=np.float64)
+    ordinals = np.array([c['date'].toordinal() for c in candidates], dtype=np.int64)
+    features = np.column_stack([
+        np.array([c['anchor_weight'] for c in candidates], dtype=np.float64),
+        positions < HEADER_CHARS,
+        positions >= text_length * (1 - FINAL_PART),
+        np.array([c['own_line'] for c in candidates], dtype=bool),
+        ordinals == ordinals.max(),
+    ]).astype(np.float64)
+    return features @ FEATURE_WEIGHTS
+
+
+def extract_decision_date(pages: List[str]) -> Optional[Dict]:
+    """Pick the decision date from the page texts.
+
+    Returns the best candidate with its score and whether it is confident
+    enough to be used without the LLM, or None when the text has no dates.
+    """
+    text = '\n'.join(pages)
+    candidates = find_date_candidates(text)
+    if not candidates:
+        return None
+    scores = score_candidates(candidates, len(text))
+    best = int(np.argmax(scores))
+    chosen = candidates[best]
+    return {
+        'day': chosen['date'].day,
+        'month': chosen['date'].month,
+        'year': chosen['date'].year,
+        'date': chosen['date'].isoformat(),
+        'raw': chosen['raw'],
+        'anchor': chosen['anchor'],
+        'score': round(float(scores[best]), 2),
+        'accepted': bool(scores[best] >= SCORE_THRESHOLD),
+        'candidates': len(candidates),
+    }
+
+
+def main():
+    """Print the decision date found in each PDF or text file."""
+    if len(sys.argv) < 2:
+        print("Usage: python decision_date.py <file.pdf|file.txt> [...]", file=sys.stderr)
+        sys.exit(1)
+
+    results = {}
+    for path in sys.argv[1:]:
+        if path.lower().endswith('.pdf'):
+            import fitz  # PyMuPDF
+            with fitz.open(path) as doc:
+                pages = [page.get_text() for page in doc]
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages = [f.read()]
+        results[path] = extract_decision_date(pages)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
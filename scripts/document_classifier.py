@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Fast Document-Type Classifier
+=============================
+
+Routes a document to the right extraction pipeline before any heavy work is
+done. Only the first page's text layer is inspected:
+
+- Header keywords (court names, tribunal names, contract/legislation markers)
+  are precompiled once; each keyword counts at most once per document, so a
+  word repeated in the body ("agreement" in an arbitration judgment) cannot
+  outvote the heading
+- The `document_types` patterns from extraction_config.json add weaker evidence
+  and are only tried against the header band (first lines of the page)
+- Keywords found inside the header band count three times
+- A court heading ("HIGH COURT", "SUPREME COURT OF INDIA", "CORAM", a neutral
+  citation) rules out the contract and legislation types
+- When the winner leads the runner-up by less than MIN_ROUTE_MARGIN, the
+  document keeps the default (full judgment) route
+
+The result names the document type and the route to take: which extractors
+to run, which prompt to send to the LLM (if any) and which OCR settings to use.
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction_config.json')
+
+# Only the top of the first page is needed to tell document types apart
+MAX_SCAN_CHARS = 1500
+HEADER_LINES = 12
+
+# Strong evidence: keywords that normally appear in the heading of each type
+HEADER_KEYWORDS = {
+    'supreme_court': [
+        r'SUPREME\s+COURT\s+OF\s+INDIA',
+        r'CIVIL\s+APPELLATE\s+JURISDICTION',
+        r'CRIMINAL\s+APPELLATE\s+JURISDICTION',
+        r'ORIGINAL\s+JURISDICTION',
+        r'SPECIAL\s+LEAVE\s+PETITION',
+        r'\d{4}\s*INSC\s*\d+',
+    ],
+    'high_court': [
+        r'HIGH\s+COURT',
+        r'COURT\s+OF\s+JUDICATURE',
+        r'WRIT\s+PETITION',
+        r'\bWRIT\s+[A-Z]\s+NO',
+        r'NEUTRAL\s+CITATION\s+NO',
+        r'\d{4}:[A-Z]{2,6}(?:-[A-Z]{2,4})?:\d+',
+        r'\bCORAM\b',
+    ],
+    'district_court': [
+        r'DISTRICT\s+(?:AND\s+SESSIONS\s+)?(?:JUDGE|COURT)',
+        r'SESSIONS\s+(?:JUDGE|COURT)',
+        r'CIVIL\s+JUDGE',
+        r'(?:CHIEF\s+)?JUDICIAL\s+MAGISTRATE',
+        r'METROPOLITAN\s+MAGISTRATE',
+        r'FAMILY\s+COURT',
+        r'COMMERCIAL\s+COURT',
+        r'PRESIDING\s+OFFICER',
+        r'\bSUIT\s+NO',
+    ],
+    'tribunal': [
+        r'TRIBUNAL',
+        r'\bNCLA?T\b',
+        r'\bITAT\b',
+        r'\bCESTAT\b',
+        r'CONSUMER\s+(?:DISPUTES\s+REDRESSAL\s+)?COMMISSION',
+        r'APPELLATE\s+AUTHORITY',
+        r'\bBENCH\s*-?\s*[IVX]+\b',
+    ],
+    'contract': [
+        r'\bAGREEMENT\b',
+        r'THIS\s+DEED',
+        r'\bWITNESSETH\b',
+        r'\bWHEREAS\b',
+        r'PARTY\s+OF\s+THE\s+(?:FIRST|SECOND)\s+PART',
+        r'HEREINAFTER\s+(?:CALLED|REFERRED\s+TO\s+AS)',
+        r'NOW\s+THEREFORE',
+    ],
+    'legislation': [
+        r'BE\s+IT\s+ENACTED',
+        # The long title of an enactment, not a citation of one
+        r'\bAN\s+ACT\s+(?:FURTHER\s+)?TO\s+(?:AMEND|CONSOLIDATE|PROVIDE|MAKE|REGULATE|ESTABLISH|DEFINE)\b',
+        r'\bRULES,?\s+\d{4}\b',
+        r'\bREGULATIONS,?\s+\d{4}\b',
+        r'GAZETTE\s+OF\s+INDIA',
+        r'\bNOTIFICATION\b',
+        r'SHORT\s+TITLE',
+        r'CHAPTER\s+I\b',
+    ],
+}
+
+KEYWORD_WEIGHT = 1.0
+CONFIG_PATTERN_WEIGHT = 0.25
+HEADER_MULTIPLIER = 3.0
+# Lead over the runner-up below which the default route is kept: one header
+# keyword more than the runner-up
+MIN_ROUTE_MARGIN = KEYWORD_WEIGHT * HEADER_MULTIPLIER
+
+# Court headings: a document carrying one is a judgment or order
+COURT_HEADER_RE = re.compile(r'HIGH\s+COURT|SUPREME\s+COURT\s+OF\s+INDIA|\bCORAM\b|NEUTRAL\s+CITATION\s+NO')
+# Types a court heading rules out
+NON_COURT_TYPES = ('contract', 'legislation')
+
+# What each document type should go through. `prompt` is the LLM prompt family
+# (None means the LLM is not worth calling), `extractors` names the field
+# extractors to run and `ocr` carries the Tesseract settings for scanned pages.
+JUDGMENT_EXTRACTORS = ['judge', 'case_referred', 'neutral_citation', 'counsel', 'decision_date']
+
+DOCUMENT_ROUTES = {
+    'supreme_court': {
+        'extractors': JUDGMENT_EXTRACTORS,
+        'prompt': 'judgment',
+        'ocr': {'psm': 6, 'lang': 'eng'},
+    },
+    'high_court': {
+        'extractors': JUDGMENT_EXTRACTORS,
+        'prompt': 'judgment',
+        'ocr': {'psm': 6, 'lang': 'eng'},
+    },
+    'district_court': {
+        'extractors': JUDGMENT_EXTRACTORS,
+        'prompt': 'judgment',
+        'ocr': {'psm': 6, 'lang': 'eng'},
+    },
+    'tribunal': {
+        'extractors': JUDGMENT_EXTRACTORS,
+        'prompt': 'judgment',
+        'ocr': {'psm': 6, 'lang': 'eng'},
+    },
+    'contract': {
+        'extractors': [],
+        'prompt': None,
+        'ocr': {'psm': 4, 'lang': 'eng'},
+    },
+    'legislation': {
+        'extractors': [],
+        'prompt': None,
+        'ocr': {'psm': 4, 'lang': 'eng'},
+    },
+}
+
+# Unknown documents keep the full judgment pipeline, as before classification existed
+DEFAULT_ROUTE = DOCUMENT_ROUTES['high_court']
+
+_compiled_types = None
+
+
+def _compile_document_types() -> Dict[str, Dict]:
+    """Compile keyword and config patterns once per process."""
+    global _compiled_types
+    if _compiled_types is not None:
+        return _compiled_types
+
+    config_types = {}
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            config_types = json.load(f).get('document_types', {})
+    except Exception as e:
+        logger.warning(f"Could not load document types from config: {e}")
+
+    compiled = {}
+    for doc_type, keywords in HEADER_KEYWORDS.items():
+        config_patterns = []
+        for field in config_types.get(doc_type, {}).get('patterns', {}).values():
+            for pattern in field.get('patterns', []):
+                try:
+                    config_patterns.append(re.compile(pattern))
+                except re.error as e:
+                    logger.warning(f"Skipping invalid {doc_type} pattern {pattern!r}: {e}")
+        compiled[doc_type] = {
+            'description': config_types.get(doc_type, {}).get('description', doc_type),
+            'keywords': [re.compile(k) for k in keywords],
+            'config_patterns': config_patterns,
+        }
+    _compiled_types = compiled
+    return compiled
+
+
+def classify_text(first_page_text: str) -> Dict:
+    """Classify a document from the text layer of its first page."""
+    start = time.perf_counter()
+    types = _compile_document_types()
+
+    text = (first_page_text or '')[:MAX_SCAN_CHARS]
+    # Keywords are compiled upper-case; one upper() is much cheaper than IGNORECASE
+    upper_text = text.upper()
+    # Offset where the header band ends
+    header_end = 0
+    for _ in range(HEADER_LINES):
+        next_newline = text.find('\n', header_end)
+        if next_newline == -1:
+            header_end = len(text)
+            break
+        header_end = next_newline + 1
+
+    court_heading = COURT_HEADER_RE.search(upper_text) is not None
+    scores = {}
+    for doc_type, compiled in types.items():
+        if court_heading and doc_type in NON_COURT_TYPES:
+            scores[doc_type] = 0.0
+            continue
+        score = 0.0
+        # Each keyword once, at its best weight
+        for keyword in compiled['keywords']:
+            if keyword.search(upper_text, 0, header_end):
+                score += KEYWORD_WEIGHT * HEADER_MULTIPLIER
+            elif keyword.search(upper_text, header_end):
+                score += KEYWORD_WEIGHT
+        # Config patterns are written for the upper-case headings of court documents
+        for pattern in compiled['config_patterns']:
+            if pattern.search(text, 0, header_end):
+                score += CONFIG_PATTERN_WEIGHT
+        scores[doc_type] = round(score, 2)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    best_type = ranked[0] if ranked else None
+    total = sum(scores.values())
+    if not best_type or scores[best_type] < KEYWORD_WEIGHT:
+        document_type = 'unknown'
+        confidence = 0.0
+        route = DEFAULT_ROUTE
+    else:
+        document_type = best_type
+        confidence = round(scores[best_type] / total, 2) if total else 0.0
+        margin = scores[best_type] - (scores[ranked[1]] if len(ranked) > 1 else 0.0)
+        # A close call keeps every extractor rather than risk dropping them
+        route = DOCUMENT_ROUTES[best_type] if margin >= MIN_ROUTE_MARGIN else DEFAULT_ROUTE
+
+    return {
+        'document_type': document_type,
+        'description': types.get(document_type, {}).get('description', 'Unrecognised document'),
+        'confidence': confidence,
+        'scores': scores,
+        'route': route,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def classify_pdf(pdf_path: str) -> Dict:
+    """Classify a PDF by reading only the text layer of its first page."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        first_page_text = doc[0].get_text() if len(doc) else ''
+    return classify_text(first_page_text)
+
+
+def main():
+    """Classify the given files and print the results as JSON."""
+    if len(sys.argv) < 2:
+        print("Usage: python document_classifier.py <file.pdf|file.txt> [...]", file=sys.stderr)
+        sys.exit(1)
+
+    results = {}
+    for path in sys.argv[1:]:
+        try:
+            if path.lower().endswith('.pdf'):
+                results[path] = classify_pdf(path)
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    results[path] = classify_text(f.read())
+        except Exception as e:
+            results[path] = {'error': str(e)}
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
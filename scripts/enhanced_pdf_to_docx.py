@@ -12,18 +12,36 @@ This script converts PDF legal documents (judgments, orders) to DOCX format whil
 
 Features:
 - Advanced text block analysis for legal document structure
-- Font preservation and mapping
+- Font preservation and mapping: paragraph styles come from the PDF's own span
+  sizes and weights, mapped once per document
 - Alignment detection and preservation
 - Watermark and artifact removal
 - Page number detection and removal
+- Running headers/footers matched by position band and digit-normalized text
 - Legal document-specific formatting rules
+- Page ranges processed in parallel worker processes, merged in page order
+- DOCX streamed with named styles (ooxml backend) or built with python-docx;
+  the ooxml backend writes each page as soon as its paragraphs are built
+
+Usage:
+    python enhanced_pdf_to_docx.py <input.pdf> <output.docx> [--workers N] [--serial]
+                                   [--backend ooxml|python-docx]
+
+An output path of "-" writes the DOCX archive to stdout; messages go to stderr.
+With the ooxml backend the first bytes go out once every page's layout has
+been read (running headers and styles need all pages), and paragraphs are
+written page by page after that; python-docx writes only when it is done.
 """
 
 import sys
 import os
+# PyMuPDF prints its messages on stdout, which carries the archive when the
+# output path is "-"
+os.environ.setdefault('PYMUPDF_MESSAGE', 'fd:2')
 import fitz  # PyMuPDF
+import numpy as np
 from docx import Document
-from docx.shared import Inches, Pt, RGBColor
+from docx.shared import Emu, Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.shared import OxmlElement, qn
 from docx.oxml.ns import nsdecls
@@ -32,29 +50,89 @@ import re
 from collections import Counter, defaultdict
 import json
 import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Sibling helper modules live next to this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ooxml_writer import StreamingDocxWriter
+from running_headers import detect_running_blocks, page_bands, running_blocks, normalize
+from page_records import PageBlocks, StringTable
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Below this many pages the process start-up costs more than it saves
+MIN_PARALLEL_PAGES = 16
+# Ranges handed to each worker; more ranges than workers evens out the load
+RANGES_PER_WORKER = 2
+
+BACKENDS = ('ooxml', 'python-docx')
+
+# Geometry thresholds. Blocks are placed against the document's text column;
+# distances are fractions of the page size (the old fixed values on an A4
+# page of 595 x 842 pt are noted alongside)
+JUSTIFY_WIDTH_RATIO = 0.67      # block spanning two thirds of the column is justified
+CENTER_TOLERANCE_RATIO = 0.04   # left and right indents equal within ~25 pt
+INDENT_RATIO = 0.02             # an edge less than ~12 pt from the column edge touches it
+RIGHT_OFFSET_RATIO = 0.17       # block starting ~100 pt right of the column centre
+PARAGRAPH_GAP_RATIO = 0.018     # vertical gap above ~15 pt starts a paragraph
+# A block less than 2.2 times its font size tall holds a single line (two
+# lines at normal leading take about 2.4)
+LINE_HEIGHT_RATIO = 2.2
+# Blocks wider than this share of the page are body text and define the column
+COLUMN_BLOCK_RATIO = 0.5
+# A page with this many body blocks gets its own column (first pages are often
+# laid out differently); otherwise the document's column is used
+MIN_PAGE_COLUMN_BLOCKS = 3
+# Column assumed when no block is that wide (1" margins)
+DEFAULT_MARGIN = 72
+
+# Font size relative to the document's body text size -> style, largest first.
+# Bold text at body size is a subheading
+FONT_STYLE_RATIOS = [(1.3, 'title'), (1.1, 'heading'), (0.95, 'body'), (0.7, 'small'), (0.0, 'footnote')]
+
+# Alignment classes in the order they are tested
+ALIGNMENTS = [WD_ALIGN_PARAGRAPH.JUSTIFY, WD_ALIGN_PARAGRAPH.CENTER, WD_ALIGN_PARAGRAPH.RIGHT]
+
+# python-docx alignment -> w:jc value for the streaming writer
+ALIGNMENT_JC = {
+    WD_ALIGN_PARAGRAPH.LEFT: 'left',
+    WD_ALIGN_PARAGRAPH.CENTER: 'center',
+    WD_ALIGN_PARAGRAPH.RIGHT: 'right',
+    WD_ALIGN_PARAGRAPH.JUSTIFY: 'both',
+}
+
+
+def _read_range_layout(pdf_path, start, end):
+    """Worker: read the layout of pages [start, end)."""
+    converter = LegalDocumentConverter()
+    with fitz.open(pdf_path) as doc:
+        return [converter.read_page_layout(doc[page_num]) for page_num in range(start, end)]
+
+
+def _build_range_paragraphs(layout, running, column, font_styles):
+    """Worker: build the paragraph records of each page in a range."""
+    converter = LegalDocumentConverter()
+    # Pt scales its value again when unpickled; Emu carries the same length as is
+    return [[(text, alignment, Emu(font_size), bold)
+             for text, alignment, font_size, bold in converter.build_page_paragraphs(page, running, column,
+                                                                                      font_styles)]
+            for page in layout]
+
+
+def page_ranges(page_count, workers):
+    """Split the pages into contiguous [start, end) ranges for the workers."""
+    range_count = max(1, min(page_count, workers * RANGES_PER_WORKER))
+    size = -(-page_count // range_count)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
 class LegalDocumentConverter:
     """Enhanced converter for legal PDF documents to DOCX format."""
     
     def __init__(self):
-        self.page_number_patterns = [
-            r'\bpage\s*no\.?\s*\d+',
-            r'\bpage\s*\d+',
-            r'\d+\s*of\s*\d+',
-            r'\(\d+\s*of\s*\d+\)',
-            r'\[CW-\d+/\d+\]',
-            r'\(\d+\s*of\s*\d+\)',
-            r'^\d+$',  # Standalone page numbers
-            r'^\s*\d+\s*$',  # Page numbers with whitespace
-            r'Page\s*\d+',
-            r'PAGE\s*\d+',
-            r'page\s*\d+'
-        ]
-        
         self.watermark_patterns = [
             r'CONFIDENTIAL',
             r'DRAFT',
@@ -73,6 +151,8 @@ class LegalDocumentConverter:
             r'[^\x00-\x7F]',  # Non-ASCII characters that might be scanner artifacts
         ]
         
+        self.enumeration_re = re.compile(r'^\d+\.?$')
+        
         # Legal document specific patterns
         self.legal_headers = [
             r'IN\s*THE\s*HIGH\s*COURT\s*OF\s*[A-Z\s]+',
@@ -93,24 +173,10 @@ class LegalDocumentConverter:
             'small': Pt(10),
             'footnote': Pt(9)
         }
-
-    def is_page_number(self, text):
-        """Check if text is a page number."""
-        if not text or len(text.strip()) < 1:
-            return False
-        
-        text_clean = text.strip()
-        
-        # Check against patterns
-        for pattern in self.page_number_patterns:
-            if re.search(pattern, text_clean, re.IGNORECASE):
-                return True
-        
-        # Check if it's just a number (likely page number)
-        if re.match(r'^\d+$', text_clean):
-            return True
-            
-        return False
+        # Font size -> style name, for backends that format through named styles
+        self.font_size_styles = {size: name for name, size in self.font_size_mapping.items()}
+        # Font names of the pages read by this converter, stored once
+        self.font_names = StringTable()
 
     def is_watermark(self, text):
         """Check if text is a watermark."""
@@ -153,29 +219,73 @@ class LegalDocumentConverter:
         
         return text.strip()
 
-    def detect_alignment(self, block):
-        """Detect text alignment based on block position and content."""
-        page_width = block[2] - block[0]  # Block width
-        page_center = (block[0] + block[2]) / 2
-        
-        # If block spans most of the page width, it's likely justified
-        if page_width > 400:  # Assuming A4 page width ~595 points
-            return WD_ALIGN_PARAGRAPH.JUSTIFY
-        
-        # Check if text is centered (common for titles)
-        if abs(block[0] - page_center) < 50:  # Within 50 points of center
-            return WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Check if text is right-aligned (common for dates, case numbers)
-        if block[0] > page_center + 100:
-            return WD_ALIGN_PARAGRAPH.RIGHT
-        
-        # Default to left alignment
-        return WD_ALIGN_PARAGRAPH.LEFT
+    def page_column(self, coords, column, page_width):
+        """Left and right edge of a page's body text.
 
-    def detect_font_size(self, block):
-        """Detect appropriate font size based on content and position."""
-        text = block[4]
+        The page's own column when it has enough body blocks, otherwise the
+        document's `column` (left, right).
+        """
+        body = coords[:, 2] - coords[:, 0] > COLUMN_BLOCK_RATIO * page_width
+        if body.sum() >= MIN_PAGE_COLUMN_BLOCKS:
+            return np.median(coords[body, 0]), np.median(coords[body, 2])
+        if column[1] <= column[0]:
+            return DEFAULT_MARGIN, page_width - DEFAULT_MARGIN
+        return column
+
+    def detect_alignments(self, coords, multi_line, column, page_width):
+        """Classify the alignment of every block on a page in one pass.
+
+        `coords` is the page's (n, 4) block coordinate array and `multi_line`
+        flags blocks with more than one line. Blocks are placed against the
+        page's text column (see page_column) and tolerances scale with the
+        real page width, so Letter, Legal and A4 pages are treated alike.
+        """
+        if not len(coords):
+            return []
+        column_left, column_right = self.page_column(coords, column, page_width)
+        left_indents = coords[:, 0] - column_left
+        right_indents = column_right - coords[:, 2]
+        column_center = (column_left + column_right) / 2
+        touches_left = left_indents <= INDENT_RATIO * page_width
+        wide = coords[:, 2] - coords[:, 0] > JUSTIFY_WIDTH_RATIO * (column_right - column_left)
+        # A wide paragraph, or a single line running edge to edge of the column
+        justified = wide & (multi_line | (touches_left & (right_indents <= INDENT_RATIO * page_width)))
+        # The short last line of a justified paragraph keeps its alignment
+        justified[1:] |= justified[:-1] & touches_left[1:] & ~multi_line[1:]
+        conditions = [
+            justified,
+            # Titles are indented equally from both sides of the column
+            ~touches_left & (np.abs(left_indents - right_indents) < CENTER_TOLERANCE_RATIO * page_width),
+            # Dates and case numbers start well right of the centre
+            coords[:, 0] > column_center + RIGHT_OFFSET_RATIO * page_width,
+        ]
+        classes = np.select(conditions, np.arange(len(ALIGNMENTS)), default=-1)
+        return [ALIGNMENTS[c] if c >= 0 else WD_ALIGN_PARAGRAPH.LEFT for c in classes]
+
+    def detect_paragraph_breaks(self, coords, sizes, column, page_width, page_height):
+        """Flag blocks that start a new paragraph rather than continue the previous block.
+
+        fitz usually returns a paragraph as one block, but some PDFs place
+        every line in its own block. A block continues the previous one only
+        when that one is a single line (less than LINE_HEIGHT_RATIO times its
+        font size tall) that either runs to the right edge of the column, or
+        starts at the same indent as this block with less than half a line
+        between them. A paragraph-sized gap always starts a new paragraph.
+        """
+        breaks = np.ones(len(coords), dtype=bool)
+        if len(coords) > 1:
+            column_right = self.page_column(coords, column, page_width)[1]
+            tolerance = INDENT_RATIO * page_width
+            previous, current = coords[:-1], coords[1:]
+            gaps = current[:, 1] - previous[:, 3]
+            one_line = previous[:, 3] - previous[:, 1] < LINE_HEIGHT_RATIO * sizes[:-1]
+            wrapped = previous[:, 2] >= column_right - tolerance
+            same_indent = (np.abs(current[:, 0] - previous[:, 0]) <= tolerance) & (gaps < 0.5 * sizes[:-1])
+            breaks[1:] = ~(one_line & (wrapped | same_indent)) | (gaps > PARAGRAPH_GAP_RATIO * page_height)
+        return breaks
+
+    def detect_font_size(self, text):
+        """Detect appropriate font size based on content."""
         
         # Check if it's a title (all caps, short length)
         if text.isupper() and len(text.strip()) < 100:
@@ -193,7 +303,7 @@ class LegalDocumentConverter:
         # Default to body text
         return self.font_size_mapping['body']
 
-    def merge_enumerated_blocks(self, blocks):
+    def merge_enumerated_blocks(self, page):
         """
         Merge blocks where a standalone enumeration number (e.g. "1.", "2.")
         appears on its own line and should be combined with the following block's
@@ -202,44 +312,51 @@ class LegalDocumentConverter:
 
         Parameters
         ----------
-        blocks : list
-            List of text blocks extracted from the page. Each block is a
-            tuple/list containing bounding box coordinates and text.
+        page : PageBlocks
+            The page's text blocks, in reading order.
 
         Returns
         -------
-        list
-            New list of blocks with enumeration numbers merged with the
-            following block's text when appropriate.
+        PageBlocks
+            New blocks with enumeration numbers merged with the following
+            block's text when appropriate.
         """
-        merged_blocks = []
-        skip_next = False
-        for i, block in enumerate(blocks):
-            if skip_next:
-                skip_next = False
-                continue
-            # Work on a mutable copy of the block
-            current_block = list(block)
-            text = current_block[4].strip() if len(current_block) > 4 else ""
+        texts = page.texts
+        kept = []
+        merged = []
+        merged_texts = []
+        i = 0
+        while i < len(texts):
+            text = texts[i].strip()
+            kept.append(i)
             # Detect patterns like "1." or "2" that represent list numbers
-            if re.match(r'^\d+\.?$', text) and i + 1 < len(blocks):
-                next_block = list(blocks[i + 1])
-                next_text = next_block[4] if len(next_block) > 4 else ""
+            if self.enumeration_re.match(text) and i + 1 < len(texts):
                 # Combine the enumeration number with the following text
-                combined_text = f"{text} {next_text}".strip()
-                # Keep the position of the enumeration block but extend the width to the next block
-                # to reflect the combined content. Use the min left and max right coordinates.
-                new_left = min(current_block[0], next_block[0])
-                new_top = current_block[1]
-                new_right = max(current_block[2], next_block[2])
-                new_bottom = max(current_block[3], next_block[3])
-                new_block = [new_left, new_top, new_right, new_bottom, combined_text]
-                merged_blocks.append(new_block)
-                skip_next = True
+                merged.append(True)
+                merged_texts.append(f"{text} {texts[i + 1]}".strip())
+                i += 2
             else:
-                # No merging necessary; append the block as-is
-                merged_blocks.append(current_block)
-        return merged_blocks
+                # No merging necessary; keep the block as-is
+                merged.append(False)
+                merged_texts.append(texts[i])
+                i += 1
+
+        result = page.take(kept, merged_texts)
+        merged = np.array(merged, dtype=bool)
+        if merged.any():
+            # Keep the top of the enumeration block but extend the box over the
+            # next block: min left, max right and max bottom
+            coords = result.coords
+            following = page.coords[np.asarray(kept)[merged] + 1]
+            coords[merged, 0] = np.minimum(coords[merged, 0], following[:, 0])
+            coords[merged, 2] = np.maximum(coords[merged, 2], following[:, 2])
+            coords[merged, 3] = np.maximum(coords[merged, 3], following[:, 3])
+            # The text after the number decides the style
+            following_rows = np.asarray(kept)[merged] + 1
+            result.fonts[merged] = page.fonts[following_rows]
+            result.sizes[merged] = page.sizes[following_rows]
+            result.bold[merged] = page.bold[following_rows]
+        return result
 
     def should_bold(self, text):
         """Determine if text should be bold based on legal document patterns."""
@@ -258,189 +375,266 @@ class LegalDocumentConverter:
         
         return False
 
-    def analyze_document_structure(self, doc):
-        """Analyze the document to identify headers, footers, and common patterns."""
+    def read_page_layout(self, page):
+        """Read a page's text blocks and their styles once, as a compact PageBlocks record."""
+        return PageBlocks.from_page(page, self.font_names)
+
+    def read_layout(self, doc):
+        """Read every page's layout in a single pass over the document."""
+        logger.info("Reading document layout...")
+        return [self.read_page_layout(page) for page in doc]
+
+    def analyze_document_structure(self, layout):
+        """Find the running headers and footers of the document.
+
+        Returns the set of (band, normalized text) keys repeated in the top or
+        bottom band of most pages, and of the page numbers in those bands; see
+        running_headers.
+        """
         logger.info("Analyzing document structure...")
-        
-        all_blocks = []
-        top_blocks = []
-        bottom_blocks = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            blocks = page.get_text("blocks")
-            
-            if blocks:
-                # Sort blocks by vertical position
-                blocks.sort(key=lambda b: b[1])
-                
-                # Collect top and bottom blocks
-                if blocks:
-                    top_blocks.append(blocks[0][4].strip())
-                    bottom_blocks.append(blocks[-1][4].strip())
-                
-                all_blocks.extend(blocks)
-        
-        # Find frequent headers and footers
-        top_counter = Counter(top_blocks)
-        bottom_counter = Counter(bottom_blocks)
-        
-        # Identify headers that appear on most pages
-        threshold = max(2, int(0.6 * len(doc)))
-        frequent_headers = {text for text, count in top_counter.items() 
-                          if count >= threshold and text.strip()}
-        frequent_footers = {text for text, count in bottom_counter.items() 
-                           if count >= threshold and text.strip()}
-        
-        logger.info(f"Found {len(frequent_headers)} frequent headers and {len(frequent_footers)} frequent footers")
-        
-        return frequent_headers, frequent_footers
+        running = detect_running_blocks(layout)
+        logger.info(f"Found {len(running)} running headers/footers")
+        return running
 
-    def convert_pdf_to_docx(self, pdf_path, docx_path):
-        """Convert PDF to DOCX with enhanced legal document processing."""
-        logger.info(f"Starting conversion: {pdf_path} -> {docx_path}")
-        
-        try:
-            # Open PDF
-            doc = fitz.open(pdf_path)
-            if not doc:
-                raise ValueError("Failed to open PDF file")
+    def detect_text_column(self, layout, running=frozenset()):
+        """Left and right edge of the body text across the whole document.
+
+        Taken as the median edges of the wide (body text) blocks, so margin
+        notes, stamps and enumeration numbers do not move the column; running
+        headers and footers are left out.
+        """
+        lefts, rights = [], []
+        for page in layout:
+            # Wide, non-empty blocks that are not running headers/footers
+            body = (page.coords[:, 2] - page.coords[:, 0] > COLUMN_BLOCK_RATIO * page.width)
+            body &= np.array([bool(text.strip()) for text in page.texts], dtype=bool).reshape(-1)
+            body &= ~np.array(running_blocks(page, running), dtype=bool).reshape(-1)
+            lefts.append(page.coords[body, 0])
+            rights.append(page.coords[body, 2])
+        if not lefts or not sum(len(edges) for edges in lefts):
+            return (0.0, 0.0)
+        return (float(np.median(np.concatenate(lefts))), float(np.median(np.concatenate(rights))))
+
+    def detect_font_styles(self, layout, running=frozenset()):
+        """Map every (font, size, bold) used in the document to a style name.
+
+        The body text size is the size carrying most characters outside the
+        running headers/footers; other sizes are styled by their ratio to it
+        (FONT_STYLE_RATIOS). Computed once per document, so building the
+        paragraphs only needs a dictionary lookup per block.
+        """
+        weights = Counter()
+        size_weights = Counter()
+        for page in layout:
+            running_rows = running_blocks(page, running)
+            for style, text, is_running in zip(page.styles(), page.texts, running_rows):
+                characters = len(text.strip())
+                weights[style] += characters
+                if not is_running:
+                    size_weights[style[1]] += characters
+        if not size_weights or not max(size_weights.values()):
+            return {}
+        body_size = max(size_weights, key=size_weights.get)
+
+        font_styles = {}
+        for font, size, bold in weights:
+            ratio = size / body_size
+            name = next(name for minimum, name in FONT_STYLE_RATIOS if ratio >= minimum)
+            if name == 'body' and bold:
+                name = 'subheading'
+            font_styles[(font, size, bold)] = name
+        logger.info(f"Body text is {body_size} pt; {len(font_styles)} font styles mapped")
+        return font_styles
+
+    def filter_blocks(self, page, running):
+        """Drop headers, footers, page numbers and artifacts; return cleaned blocks."""
+        kept = []
+        cleaned_texts = []
+        for i, (text, band) in enumerate(zip(page.texts, page_bands(page))):
+            text = text.strip()
             
-            # Create Word document
-            document = Document()
+            # Skip empty blocks
+            if not text:
+                continue
+            
+            # Skip running headers, footers and page numbers; they only live in
+            # the top and bottom bands, and the running set holds all of them
+            if band and (band, normalize(text)) in running:
+                logger.debug(f"Skipping running header/footer: {text[:50]}...")
+                continue
             
-            # Set document margins for legal documents
-            sections = document.sections
-            for section in sections:
-                section.top_margin = Inches(1)
-                section.bottom_margin = Inches(1)
-                section.left_margin = Inches(1.25)
-                section.right_margin = Inches(1.25)
+            # Skip watermarks
+            if self.is_watermark(text):
+                logger.debug(f"Skipping watermark: {text}")
+                continue
             
-            # Analyze document structure
-            frequent_headers, frequent_footers = self.analyze_document_structure(doc)
+            # Skip scanner artifacts
+            if self.is_scanner_artifact(text):
+                logger.debug(f"Skipping scanner artifact: {text[:50]}...")
+                continue
             
-            # Process each page
-            for page_num in range(len(doc)):
-                logger.info(f"Processing page {page_num + 1}/{len(doc)}")
-                
-                page = doc[page_num]
-                blocks = page.get_text("blocks")
-                
-                if not blocks:
-                    continue
-                
-                # Filter out headers, footers, page numbers, and artifacts
-                filtered_blocks = []
-                for block in blocks:
-                    text = block[4].strip()
-                    
-                    # Skip empty blocks
-                    if not text:
-                        continue
-                    
-                    # Skip frequent headers and footers
-                    if text in frequent_headers or text in frequent_footers:
-                        logger.debug(f"Skipping frequent header/footer: {text[:50]}...")
-                        continue
-                    
-                    # Skip page numbers
-                    if self.is_page_number(text):
-                        logger.debug(f"Skipping page number: {text}")
-                        continue
-                    
-                    # Skip watermarks
-                    if self.is_watermark(text):
-                        logger.debug(f"Skipping watermark: {text}")
-                        continue
-                    
-                    # Skip scanner artifacts
-                    if self.is_scanner_artifact(text):
-                        logger.debug(f"Skipping scanner artifact: {text[:50]}...")
-                        continue
-                    
-                    # Clean the text
-                    cleaned_text = self.clean_text(text)
-                    if cleaned_text:
-                        # Update block with cleaned text
-                        block = list(block)
-                        block[4] = cleaned_text
-                        filtered_blocks.append(block)
-                
-                # Sort blocks by vertical position, then horizontal
-                filtered_blocks.sort(key=lambda b: (b[1], b[0]))
-
-                # Merge enumeration numbers (e.g. "1.") with the following block's text
-                merged_blocks = self.merge_enumerated_blocks(filtered_blocks)
-
-                # Process blocks and create paragraphs
+            # Clean the text
+            cleaned_text = self.clean_text(text)
+            if cleaned_text:
+                kept.append(i)
+                cleaned_texts.append(cleaned_text)
+        
+        filtered = page.take(kept, cleaned_texts)
+        # Sort blocks by vertical position, then horizontal
+        order = np.lexsort((filtered.coords[:, 0], filtered.coords[:, 1]))
+        return filtered.take(order)
+
+    def build_page_paragraphs(self, page_layout, running=frozenset(), column=(0.0, 0.0), font_styles=None):
+        """Turn a page's layout into paragraph records (text, alignment, font_size, bold).
+
+        Size and weight come from the blocks' own fonts through `font_styles`
+        (see detect_font_styles); without it, or for a font it does not know,
+        they are guessed from the text.
+        """
+        filtered_blocks = self.filter_blocks(page_layout, running)
+
+        # Merge enumeration numbers (e.g. "1.") with the following block's text
+        merged_blocks = self.merge_enumerated_blocks(filtered_blocks)
+
+        # Geometry of the whole page at once
+        coords = merged_blocks.coords.astype(np.float64)
+        multi_line = np.array(['\n' in text for text in merged_blocks.texts], dtype=bool).reshape(-1)
+        alignments = self.detect_alignments(coords, multi_line, column, page_layout.width)
+        paragraph_breaks = self.detect_paragraph_breaks(coords, merged_blocks.sizes.astype(np.float64), column,
+                                                        page_layout.width, page_layout.height)
+        styles = merged_blocks.styles()
+        font_styles = font_styles or {}
+
+        paragraphs = []
+        current_paragraph_text = ""
+        current_alignment = WD_ALIGN_PARAGRAPH.LEFT
+        current_font_size = self.font_size_mapping['body']
+        current_bold = False
+
+        for i, text in enumerate(merged_blocks.texts):
+            # Detect formatting for this block
+            alignment = alignments[i]
+            style_name = font_styles.get(styles[i])
+            if style_name:
+                font_size = self.font_size_mapping[style_name]
+                bold = styles[i][2]
+            else:
+                font_size = self.detect_font_size(text)
+                bold = self.should_bold(text)
+
+            # Check if we should start a new paragraph
+            should_new_paragraph = False
+
+            # Different alignment requires new paragraph
+            if alignment != current_alignment:
+                should_new_paragraph = True
+
+            # Different font size requires new paragraph
+            if font_size != current_font_size:
+                should_new_paragraph = True
+
+            # Different bold setting requires new paragraph
+            if bold != current_bold:
+                should_new_paragraph = True
+
+            # Block does not continue the previous one (gap, or previous line not wrapped)
+            if paragraph_breaks[i]:
+                should_new_paragraph = True
+
+            # If we need a new paragraph, save the current one
+            if should_new_paragraph and current_paragraph_text:
+                paragraphs.append((current_paragraph_text, current_alignment, current_font_size, current_bold))
                 current_paragraph_text = ""
-                current_alignment = WD_ALIGN_PARAGRAPH.LEFT
-                current_font_size = self.font_size_mapping['body']
-                current_bold = False
-
-                for i, block in enumerate(merged_blocks):
-                    text = block[4]
-
-                    # Detect formatting for this block
-                    alignment = self.detect_alignment(block)
-                    font_size = self.detect_font_size(block)
-                    bold = self.should_bold(text)
-
-                    # Check if we should start a new paragraph
-                    should_new_paragraph = False
-
-                    # Different alignment requires new paragraph
-                    if alignment != current_alignment:
-                        should_new_paragraph = True
-
-                    # Different font size requires new paragraph
-                    if font_size != current_font_size:
-                        should_new_paragraph = True
-
-                    # Different bold setting requires new paragraph
-                    if bold != current_bold:
-                        should_new_paragraph = True
-
-                    # Significant vertical gap indicates new paragraph
-                    if i > 0:
-                        prev_block = merged_blocks[i-1]
-                        vertical_gap = block[1] - (prev_block[1] + prev_block[3])
-                        if vertical_gap > 15:  # More than 15 points gap
-                            should_new_paragraph = True
-
-                    # If we need a new paragraph, save the current one
-                    if should_new_paragraph and current_paragraph_text:
-                        self.add_paragraph_to_document(
-                            document, current_paragraph_text,
-                            current_alignment, current_font_size, current_bold
-                        )
-                        current_paragraph_text = ""
-
-                    # Update current formatting
-                    current_alignment = alignment
-                    current_font_size = font_size
-                    current_bold = bold
-
-                    # Add text to current paragraph
-                    if current_paragraph_text:
-                        current_paragraph_text += " " + text
-                    else:
-                        current_paragraph_text = text
-
-                # Add the last paragraph
-                if current_paragraph_text:
-                    self.add_paragraph_to_document(
-                        document, current_paragraph_text,
-                        current_alignment, current_font_size, current_bold
-                    )
-                
-                # Add page break between pages (except for the last page)
-                if page_num < len(doc) - 1:
-                    document.add_page_break()
+
+            # Update current formatting
+            current_alignment = alignment
+            current_font_size = font_size
+            current_bold = bold
+
+            # Add text to current paragraph
+            if current_paragraph_text:
+                current_paragraph_text += " " + text
+            else:
+                current_paragraph_text = text
+
+        # Add the last paragraph
+        if current_paragraph_text:
+            paragraphs.append((current_paragraph_text, current_alignment, current_font_size, current_bold))
+
+        return paragraphs
+
+    def iter_document_paragraphs(self, pdf_path, workers=None, serial=False):
+        """Yield the paragraph records of each page, in page order, as pages are done.
+
+        Pages are read and processed in ranges by a pool of worker processes;
+        `serial` (or a single worker, or a short document) keeps everything in
+        this process. Headers/footers, the text column and the font styles
+        need every page's layout, so the first page comes after all pages are
+        read; paragraphs are then built page by page (range by range in the
+        pool) while the caller writes the earlier ones.
+        """
+        workers = workers or os.cpu_count() or 1
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+            if serial or workers <= 1 or page_count < MIN_PARALLEL_PAGES:
+                logger.info("Processing pages serially")
+                # Read every page's blocks once; structure analysis and paragraph
+                # building both work from this layout
+                layout = self.read_layout(doc)
+            else:
+                layout = None
+
+        if layout is not None:
+            running = self.analyze_document_structure(layout)
+            column = self.detect_text_column(layout, running)
+            font_styles = self.detect_font_styles(layout, running)
+            for page_num in range(page_count):
+                logger.info(f"Processing page {page_num + 1}/{page_count}")
+                page_layout = layout[page_num]
+                # Release the page's blocks once its paragraphs are built
+                layout[page_num] = None
+                yield self.build_page_paragraphs(page_layout, running, column, font_styles)
+            return
+
+        ranges = page_ranges(page_count, workers)
+        logger.info(f"Processing {page_count} pages in {len(ranges)} ranges with {workers} workers")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Stage 1: layout of every range; headers/footers need all pages
+            range_layouts = list(pool.map(_read_range_layout, [pdf_path] * len(ranges),
+                                          [start for start, _ in ranges], [end for _, end in ranges]))
+            document_layout = [page for layout in range_layouts for page in layout]
+            running = self.analyze_document_structure(document_layout)
+            column = self.detect_text_column(document_layout, running)
+            font_styles = self.detect_font_styles(document_layout, running)
+            del document_layout
+            # Stage 2: paragraph records per range, yielded in range order as
+            # each range (and the ones before it) is done
+            range_pages = pool.map(_build_range_paragraphs, range_layouts,
+                                   [running] * len(ranges), [column] * len(ranges),
+                                   [font_styles] * len(ranges))
+            del range_layouts
+            for pages in range_pages:
+                yield from pages
+
+    def build_document_paragraphs(self, pdf_path, workers=None, serial=False):
+        """Return the paragraph records of every page, in page order."""
+        return list(self.iter_document_paragraphs(pdf_path, workers=workers, serial=serial))
+
+    def convert_pdf_to_docx(self, pdf_path, docx_path, workers=None, serial=False, backend='ooxml'):
+        """Convert PDF to DOCX with enhanced legal document processing."""
+        logger.info(f"Starting conversion: {pdf_path} -> {docx_path} ({backend} backend)")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown DOCX backend: {backend}")
+        
+        try:
+            # A generator: the ooxml backend writes each page while later
+            # ones are still being built
+            pages = self.iter_document_paragraphs(pdf_path, workers=workers, serial=serial)
             
-            # Save the document
-            document.save(docx_path)
+            if backend == 'ooxml':
+                self.write_docx_streaming(pages, docx_path)
+            else:
+                self.write_docx_python_docx(pages, docx_path)
             logger.info(f"Successfully converted PDF to DOCX: {docx_path}")
             
             return True
@@ -448,9 +642,50 @@ class LegalDocumentConverter:
         except Exception as e:
             logger.error(f"Error during conversion: {str(e)}")
             raise
-        finally:
-            if 'doc' in locals():
-                doc.close()
+
+    def write_docx_streaming(self, pages, target):
+        """Stream the paragraph records into a DOCX formatted with named styles.
+
+        `pages` may be any iterable of per-page records; each page is written
+        to `target` as soon as it is taken from it.
+        """
+        with StreamingDocxWriter(target) as writer:
+            # Merge the pages in order
+            for page_num, paragraphs in enumerate(pages):
+                # Page break between pages (before every page but the first)
+                if page_num:
+                    writer.add_page_break()
+                for text, alignment, font_size, bold in paragraphs:
+                    writer.add_paragraph(text, self.font_size_styles.get(font_size, 'body'),
+                                         ALIGNMENT_JC.get(alignment, 'left'), bold)
+
+    def write_docx_python_docx(self, pages, docx_path):
+        """Build the DOCX with python-docx, formatting every run directly.
+
+        python-docx holds the whole document until it is saved: nothing
+        reaches `docx_path` before the last page is added.
+        """
+        # Create Word document
+        document = Document()
+        
+        # Set document margins for legal documents
+        sections = document.sections
+        for section in sections:
+            section.top_margin = Inches(1)
+            section.bottom_margin = Inches(1)
+            section.left_margin = Inches(1.25)
+            section.right_margin = Inches(1.25)
+        
+        # Merge the pages in order
+        for page_num, paragraphs in enumerate(pages):
+            # Page break between pages (before every page but the first)
+            if page_num:
+                document.add_page_break()
+            for text, alignment, font_size, bold in paragraphs:
+                self.add_paragraph_to_document(document, text, alignment, font_size, bold)
+        
+        # Save the document
+        document.save(docx_path)
 
     def add_paragraph_to_document(self, document, text, alignment, font_size, bold):
         """Add a paragraph to the document with specified formatting."""
@@ -469,29 +704,47 @@ class LegalDocumentConverter:
 
 def main():
     """Main function for command-line usage."""
-    if len(sys.argv) != 3:
-        print("Usage: python enhanced_pdf_to_docx.py <input.pdf> <output.docx>", file=sys.stderr)
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Convert legal PDF documents to DOCX")
+    parser.add_argument('pdf_path', help="input PDF")
+    parser.add_argument('docx_path', help="output DOCX")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for page ranges (default: CPU count)")
+    parser.add_argument('--serial', action='store_true', help="process all pages in this process")
+    parser.add_argument('--backend', choices=BACKENDS, default='ooxml',
+                        help="ooxml streams the DOCX with named styles; python-docx builds it in memory")
+    args = parser.parse_args()
     
-    pdf_path = sys.argv[1]
-    docx_path = sys.argv[2]
+    pdf_path = args.pdf_path
+    docx_path = args.docx_path
+    to_stdout = docx_path == '-'
     
     # Validate input file
     if not os.path.exists(pdf_path):
         print(f"Error: Input PDF file not found: {pdf_path}", file=sys.stderr)
         sys.exit(1)
     
-    # Create output directory if needed
-    output_dir = os.path.dirname(docx_path)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    if to_stdout:
+        # Keep the real stdout for the archive only; anything else printed
+        # from here on (including by worker processes) goes to stderr
+        target = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+        sys.stdout.flush()
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    else:
+        target = docx_path
+        # Create output directory if needed
+        output_dir = os.path.dirname(docx_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
     
     # Convert PDF to DOCX
     converter = LegalDocumentConverter()
     try:
-        success = converter.convert_pdf_to_docx(pdf_path, docx_path)
+        success = converter.convert_pdf_to_docx(pdf_path, target, workers=args.workers, serial=args.serial,
+                                                 backend=args.backend)
+        if to_stdout:
+            target.close()
         if success:
-            print(f"Successfully converted {pdf_path} to {docx_path}")
+            print(f"Successfully converted {pdf_path} to {'stdout' if to_stdout else docx_path}")
         else:
             print("Conversion failed", file=sys.stderr)
             sys.exit(1)
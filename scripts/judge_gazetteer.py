@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Judge Roster Gazetteer
+======================
+
+Finds judge names by looking them up in a local roster of sitting and former
+judges instead of asking the LLM.
+
+- The roster (judge_gazetteer.json) lists judges per citation category
+  ("SC", "All", "Bom", "Utt", ...), the same keys _map_court_info produces
+- It is loaded once per process into a token trie. Each name is inserted as
+  written, with its given names reduced to initials ("B. R. Gavai") and
+  without middle initials ("Nivedita Mehta")
+- Only the CORAM window (CORAM / BEFORE / Hon'ble lines on the first pages)
+  and the signature window (end of the last page) are scanned
+- A window is only trusted when every judge line in it is on the roster: a
+  bench with one judge missing from the roster is left to the other paths
+  rather than reported short
+
+Usage:
+    python judge_gazetteer.py <file.pdf|file.txt> [...]
+    python judge_gazetteer.py --rebuild <result.json|results_dir> [...]
+"""
+
+import sys
+import os
+import re
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'judge_gazetteer.json')
+
+# CORAM / "Hon'ble ... J." lines are on the first pages only
+MAX_PAGES = 2
+CORAM_WINDOW_CHARS = 300
+SIGNATURE_WINDOW_CHARS = 1200
+
+# Line-start anchors only: "Hon'ble Supreme Court" in the body is not a bench
+CORAM_ANCHOR_RE = re.compile(r'\bCORAM\b|^\s*(?:BEFORE|PRESENT)\b|^\s*HON\'?\s*BLE\b', re.IGNORECASE | re.MULTILINE)
+TOKEN_RE = re.compile(r'[A-Z]+')
+# A line closing a bench or a signature: "KULKARNI, J.", "A & B, JJ.", "(X, J.) (Oral)"
+BENCH_END_RE = re.compile(r'(?:,|\s)\s*JJ?\s*\.?\s*\)?\s*(?:\((?:ORAL|DICTATED)\))?\s*$', re.IGNORECASE)
+# A line after the bench: dates, headings, parties and counsel
+BENCH_STOP_RE = re.compile(r'\b(?:DATED?|RESERVED|PRONOUNCED|DELIVERED|JUDG(?:E)?MENT|ORDER|HEARD|'
+                           r'ADVOCATES?|COUNSEL|PETITIONERS?|RESPONDENTS?|APPELLANTS?)\b|\d', re.IGNORECASE)
+# Separators between the judges of a bench
+BENCH_SPLIT_RE = re.compile(r',|&|\bAND\b', re.IGNORECASE)
+# Words around judge names that are not part of them
+BENCH_WORDS = frozenset({'CORAM', 'BEFORE', 'PRESENT', 'HON', 'BLE', 'HONBLE', 'THE', 'MR', 'MRS', 'MS', 'DR',
+                         'JUSTICE', 'CHIEF', 'ACTING', 'J', 'JJ', 'ORAL', 'DICTATED'})
+BENCH_MAX_LINES = 8
+
+# Marks a trie node that ends a name; holds the roster entry ids
+TERMINAL = '$'
+
+_gazetteer = None
+
+
+def _tokens(name: str) -> List[str]:
+    """Upper-case letter runs: "B.R. Gavai" -> ['B', 'R', 'GAVAI']"""
+    return TOKEN_RE.findall(name.upper())
+
+
+def _variants(tokens: List[str]) -> List[Tuple[str, ...]]:
+    """Token sequences a name may appear as in a judgment."""
+    variants = {tuple(tokens)}
+    if len(tokens) > 1:
+        # Given names as initials: "Bhushan Ramkrishna Gavai" -> "B R GAVAI"
+        variants.add(tuple(t[0] for t in tokens[:-1]) + (tokens[-1],))
+        # Middle initials dropped: "Nivedita P. Mehta" -> "NIVEDITA MEHTA"
+        kept = [t for t in tokens[1:-1] if len(t) > 1]
+        variants.add((tokens[0],) + tuple(kept) + (tokens[-1],))
+    return list(variants)
+
+
+def load_gazetteer(path: str = GAZETTEER_PATH) -> Dict:
+    """Load the roster and build its trie, once per process."""
+    global _gazetteer
+    if _gazetteer is not None and _gazetteer['path'] == path:
+        return _gazetteer
+
+    courts = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            courts = json.load(f).get('courts', {})
+    except Exception as e:
+        logger.warning(f"Could not load judge gazetteer: {e}")
+
+    # Entry id -> canonical name and the courts it is listed under
+    entries = []
+    by_name = {}
+    for court, names in courts.items():
+        for name in names:
+            key = ' '.join(_tokens(name))
+            if key not in by_name:
+                by_name[key] = len(entries)
+                entries.append({'name': name, 'courts': []})
+            entries[by_name[key]]['courts'].append(court)
+
+    trie = {}
+    for entry_id, entry in enumerate(entries):
+        for variant in _variants(_tokens(entry['name'])):
+            node = trie
+            for token in variant:
+                node = node.setdefault(token, {})
+            ids = node.setdefault(TERMINAL, [])
+            if entry_id not in ids:
+                ids.append(entry_id)
+
+    _gazetteer = {'path': path, 'entries': entries, 'trie': trie}
+    return _gazetteer
+
+
+def match_judges(text: str, court: Optional[str] = None, gazetteer: Dict = None) -> List[str]:
+    """Return roster names found in text, in order of appearance.
+
+    Longest match wins at each position. A variant shared by several judges
+    (e.g. the same initials and surname) is only accepted when `court` picks
+    exactly one of them.
+    """
+    gazetteer = gazetteer or load_gazetteer()
+    trie, entries = gazetteer['trie'], gazetteer['entries']
+    tokens = _tokens(text)
+    found = []
+    i = 0
+    while i < len(tokens):
+        node = trie
+        best_ids, best_end = None, i
+        for j in range(i, len(tokens)):
+            node = node.get(tokens[j])
+            if node is None:
+                break
+            if TERMINAL in node:
+                best_ids, best_end = node[TERMINAL], j + 1
+        if best_ids:
+            if len(best_ids) > 1 and court:
+                best_ids = [e for e in best_ids if court in entries[e]['courts']]
+            if len(best_ids) == 1:
+                name = entries[best_ids[0]]['name']
+                if name not in found:
+                    found.append(name)
+            i = best_end
+        else:
+            i += 1
+    return found
+
+
+def _judge_pieces(line: str) -> List[str]:
+    """The parts of a bench line that carry a name: "A & B, JJ." -> ['A ', ' B']"""
+    return [piece for piece in BENCH_SPLIT_RE.split(line)
+            if any(len(token) > 1 and token not in BENCH_WORDS for token in _tokens(piece))]
+
+
+def coram_window(pages: List[str], max_pages: int = MAX_PAGES) -> List[str]:
+    """One piece of text per judge of the first bench after a CORAM / BEFORE / Hon'ble anchor.
+
+    The bench runs from the anchor to the line ending in "J." / "JJ.", and
+    stops early at a blank line (unless the line before ends in "&", "and"
+    or ","), a date, a heading or the parties.
+    """
+    text = '\n'.join(pages[:max_pages])
+    for match in CORAM_ANCHOR_RE.finditer(text):
+        window = text[match.start():match.end() + CORAM_WINDOW_CHARS]
+        pieces = []
+        continued = True
+        for line in window.splitlines()[:BENCH_MAX_LINES]:
+            if not line.strip():
+                if pieces and not continued:
+                    break
+                continue
+            if pieces and BENCH_STOP_RE.search(line):
+                break
+            pieces += _judge_pieces(line)
+            if pieces and BENCH_END_RE.search(line):
+                break
+            continued = re.search(r'(?:&|,|\bAND)\s*$', line, re.IGNORECASE) is not None
+        if pieces:
+            return pieces
+    return []
+
+
+def signature_window(pages: List[str]) -> List[str]:
+    """One piece of text per judge signing at the end of the last page ("(X, J.)" lines)."""
+    tail = pages[-1][-SIGNATURE_WINDOW_CHARS:] if pages else ''
+    return [piece for line in tail.splitlines() if BENCH_END_RE.search(line) for piece in _judge_pieces(line)]
+
+
+def format_judges(names: List[str]) -> Tuple[str, str]:
+    """Format names as (judgeName, allJudges): "Hon'ble A J." / "Hon'ble A, Hon'ble B JJ." """
+    if not names:
+        return 'none', 'none'
+    judge_name = f"Hon'ble {names[0]} J."
+    if len(names) == 1:
+        return judge_name, judge_name
+    return judge_name, ', '.join(f"Hon'ble {n}" for n in names) + " JJ."
+
+
+def find_judges(pages: List[str], court: Optional[str] = None) -> Optional[Dict]:
+    """Find the bench in the CORAM window, falling back to the signature window.
+
+    A window counts only when each of its judge pieces matches a roster name,
+    and the signatures only when there are as many as judges in the CORAM
+    window; None when neither window is fully on the roster.
+    """
+    bench_size = 0
+    for window, pieces in (('coram', coram_window(pages)), ('signature', signature_window(pages))):
+        matches = [match_judges(piece, court) for piece in pieces]
+        bench_size = max(bench_size, len(pieces))
+        if not pieces or len(pieces) < bench_size or not all(matches):
+            missing = [piece.strip() for piece, found in zip(pieces, matches) if not found]
+            if missing:
+                logger.info(f"Judges not on the roster in the {window} window: {missing}")
+            continue
+        names = []
+        for found in matches:
+            names += [name for name in found if name not in names]
+        judge_name, all_judges = format_judges(names)
+        return {'judges': names, 'judgeName': judge_name, 'allJudges': all_judges, 'window': window}
+    return None
+
+
+def parse_formatted_judges(value: str) -> List[str]:
+    """Split "Hon'ble A, Hon'ble B JJ." (or a plain "A, B") back into names."""
+    if not value or value == 'none':
+        return []
+    value = re.sub(r'\s*\((?:oral|dictated)\)', '', value, flags=re.IGNORECASE)
+    value = re.sub(r',?\s*JJ?\.?\s*$', '', value.strip())
+    names = []
+    for piece in re.split(r',|\band\b|&', value):
+        piece = re.sub(r'^\s*(?:Hon\'?ble\s+)?(?:(?:Mr|Mrs|Ms|Dr)\.?\s+)?(?:Justice\s+)?', '', piece, flags=re.IGNORECASE)
+        piece = ' '.join(piece.split()).strip(' .')
+        if len(_tokens(piece)) >= 2 and piece not in names:
+            names.append(piece)
+    return names
+
+
+def _iter_results(paths: List[str]):
+    """Yield extraction results from JSON files or directories of JSON files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith('.json'))
+        else:
+            files.append(path)
+    for file_path in files:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Skipping {file_path}: {e}")
+            continue
+        # A single result, a list of results or a {path: result} map
+        if isinstance(data, dict) and 'courtDetailRequest' not in data:
+            data = list(data.values())
+        for result in data if isinstance(data, list) else [data]:
+            if isinstance(result, dict) and 'courtDetailRequest' in result:
+                yield result
+
+
+def rebuild(result_paths: List[str], path: str = GAZETTEER_PATH) -> Dict:
+    """Merge the judges of accumulated extraction results into the roster."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            courts = json.load(f).get('courts', {})
+    except FileNotFoundError:
+        courts = {}
+
+    known = {court: {' '.join(_tokens(n)) for n in names} for court, names in courts.items()}
+    added = 0
+    for result in _iter_results(result_paths):
+        court = (result.get('courtDetailRequest') or {}).get('citationCategory')
+        if not court:
+            continue
+        names = parse_formatted_judges((result.get('courtDetailRequest') or {}).get('allJudges'))
+        names = names or parse_formatted_judges(result.get('judgeName'))
+        for name in names:
+            key = ' '.join(_tokens(name))
+            if key not in known.setdefault(court, set()):
+                known[court].add(key)
+                courts.setdefault(court, []).append(name)
+                added += 1
+
+    courts = {court: sorted(names, key=lambda n: _tokens(n)[-1]) for court, names in sorted(courts.items())}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'courts': courts}, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+    global _gazetteer
+    _gazetteer = None
+    return {'added': added, 'judges': sum(len(n) for n in courts.values()), 'courts': len(courts)}
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python judge_gazetteer.py [--rebuild] <file> [...]", file=sys.stderr)
+        sys.exit(1)
+    if args[0] == '--rebuild':
+        print(json.dumps(rebuild(args[1:]), indent=2))
+        return
+
+    results = {}
+    for path in args:
+        if path.lower().endswith('.pdf'):
+            import fitz  # PyMuPDF
+            with fitz.open(path) as doc:
+                pages = [page.get_text() for page in doc]
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages = f.read().split('\f')
+        results[path] = find_judges(pages)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import base64
 import io
+from html import escape
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +33,9 @@ except ImportError:
     logger.warning("OpenAI not available")
 
 # Document processing libraries
+# PyMuPDF prints its messages on stdout, which carries the JSON result (or the
+# HTML with --judgement-order)
+os.environ.setdefault('PYMUPDF_MESSAGE', 'fd:2')
 try:
     import fitz  # PyMuPDF
     PDF_AVAILABLE = True
@@ -50,6 +54,34 @@ except ImportError:
     OCR_AVAILABLE = False
     logger.warning("OCR libraries not available")
 
+# Sibling helper modules live next to this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from document_classifier import classify_text, DEFAULT_ROUTE
+from neutral_citation import find_neutral_citation
+from counsel_extractor import extract_counsel
+from decision_date import extract_decision_date
+from judge_gazetteer import find_judges, format_judges, parse_formatted_judges
+from running_headers import detect_running_lines, strip_running_lines
+from page_records import PageSpans, StringTable, is_bold
+from page_iterator import iter_pages
+from ocr_pages import iter_ocr_frames
+from page_preflight import preflight_pages, summarize as summarize_preflight
+
+# Rule-based results at or above this confidence replace what the LLM returned
+DETERMINISTIC_CONFIDENCE_THRESHOLD = 0.75
+
+# Metadata-only mode reads this many pages at each end of a PDF first, and
+# as many more per end each time a field is still missing
+METADATA_WINDOW_PAGES = 2
+# Cues that a metadata field is on the pages read so far; the caseResult
+# comes from the last pages, which are always read
+METADATA_FIELD_CUES = {
+    'court': re.compile(r'\b(?:HIGH|SUPREME)\s+COURT\b|Neutral\s+Citation', re.IGNORECASE),
+    'parties': re.compile(r'\b(?:versus\b|vs?\.|respondents?\b)', re.IGNORECASE),
+    'caseNumber': re.compile(r'\bNo\.?\s*\d+\s*(?:/|of)\s*\d{4}\b', re.IGNORECASE),
+    'judge': re.compile(r"\bHon'?ble\b|\bCORAM\b|\bJustice\b", re.IGNORECASE),
+}
+
 # Helper for robust high court pattern
 import re
 
@@ -59,10 +91,17 @@ def make_high_court_pattern(state):
     return rf'high court\b[^\n]*?{state}\b|{state}\b[^\n]*?high court\b'
 
 class AILegalDocumentExtractor:
-    def __init__(self, api_key: str = None, model: str = "gpt-4-0613", max_retries: int = 3):
+    def __init__(self, api_key: str = None, model: str = "gpt-4-0613", max_retries: int = 3,
+                 judgement_order: bool = True, metadata_only: bool = False,
+                 metadata_window: int = METADATA_WINDOW_PAGES):
         self.api_key = api_key or os.environ.get('OPENAI_API_KEY') or self._load_api_key_from_config()
         self.model = model
         self.max_retries = max_retries
+        # False leaves judgementOrder empty; the server renders it on request
+        self.judgement_order = judgement_order
+        # True reads (and OCRs) only the first and last pages a PDF's metadata needs
+        self.metadata_only = metadata_only
+        self.metadata_window = metadata_window
         self.rate_limit_reset_time = None
         self.last_api_call_time = None
         self.min_delay_between_calls = 1.0  # Minimum 1 second between calls
@@ -115,11 +154,9 @@ class AILegalDocumentExtractor:
         
         try:
             if file_ext == '.pdf':
-                result = self._extract_from_pdf(file_path)
-                # Add judgementOrder HTML for CKEditor
-                result['judgementOrder'] = extract_judgement_html_ck(file_path)
-                return result
-            elif file_ext in ['.jpg', '.jpeg', '.png', '.tiff', '.bmp']:
+                # _extract_from_pdf adds the judgementOrder HTML for CKEditor
+                return self._extract_from_pdf(file_path)
+            elif file_ext in ['.jpg', '.jpeg', '.png', '.tif', '.tiff', '.bmp']:
                 result = self._extract_from_image(file_path)
                 result['judgementOrder'] = ''  # Not applicable for images
                 return result
@@ -143,73 +180,132 @@ class AILegalDocumentExtractor:
         
         try:
             doc = fitz.open(pdf_path)
-            text = ""
-            images_processed = 0
+            # Classify from the first page's text layer to pick the pipeline
+            classification = classify_text(doc[0].get_text() if len(doc) else "")
+            ocr_settings = classification['route']['ocr']
+            logger.info(f"Document classified as {classification['document_type']} "
+                        f"(confidence {classification['confidence']}) in {classification['elapsed_ms']} ms")
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Try direct text extraction first
-                page_text = page.get_text()
-                
-                # If no text found, try OCR on page image
-                if not page_text.strip() and OCR_AVAILABLE:
-                    logger.info(f"No text found on page {page_num + 1}, using OCR")
-                    pix = page.get_pixmap()
-                    img_data = pix.tobytes("png")
-                    img = Image.open(io.BytesIO(img_data))
-                    page_text = pytesseract.image_to_string(img, config='--psm 6')
-                    images_processed += 1
-                
-                text += page_text + "\n"
+            page_count = len(doc)
+            # Page number -> PageRecord, and preflight (page kind), of the pages read
+            records, preflight = {}, {}
+            if self.metadata_only:
+                missing_fields = self._read_metadata_pages(doc, ocr_settings, records, preflight)
+            else:
+                missing_fields = []
+                self._read_pages(doc, range(1, page_count + 1), ocr_settings, records, preflight)
+            pages = [records[page_no].text for page_no in sorted(records)]
+            ocr_pages = sorted(page_no for page_no, record in records.items() if record.source == 'ocr')
             
-            logger.info(f"PDF processed: {len(doc)} pages, {images_processed} pages with OCR")
+            logger.info(f"PDF processed: {len(pages)} of {page_count} pages read, {len(ocr_pages)} pages with OCR")
             doc.close()
             
+            text = ''.join(page_text + "\n" for page_text in pages)
             if not text.strip():
                 return self._create_error_result("No text content found in PDF")
 
             # --- Find caseResult from last paragraphs/lines ---
-            last_case_result = None
-            # Canonical mapping for result phrases
-            result_map = [
-                ("dismissed", "Petition dismissed"),
-                ("allowed", "Petition allowed"),
-                ("disposed of", "Disposed of"),
-                ("order accordingly", "Order accordingly")
-            ]
-            import re
-            # Split into paragraphs (by double newlines or by period)
-            paragraphs = [p.strip() for p in re.split(r'\n\s*\n|(?<=\.)\s*\n', text) if p.strip()]
-            # Also check last 5 lines for extra robustness
-            lines = [l.strip() for l in text.split('\n') if l.strip()]
-            # Check last 5 paragraphs, then last 5 lines
-            search_blocks = (paragraphs[-5:] if len(paragraphs) >= 5 else paragraphs) + (lines[-5:] if len(lines) >= 5 else lines)
-            found = False
-            for block in search_blocks[::-1]:  # Search from last to first
-                block_lower = block.lower()
-                for key, canonical in result_map:
-                    if key in block_lower:
-                        last_case_result = canonical
-                        found = True
-                        break
-                if found:
-                    break
+            last_case_result = self._find_case_result(pages)
             # Extract as usual
-            result = self.extract_from_text(text)
+            result = self.extract_from_text(text, classification=classification, pages=pages)
             # Strictly enforce allowed caseResult values
             if last_case_result:
                 result["caseResult"] = last_case_result
             else:
                 result["caseResult"] = "none"
+            result.setdefault('extractionMetadata', {})['pdf_processing'] = {
+                "mode": "metadata_only" if self.metadata_only else "full",
+                "page_count": page_count,
+                "pages_read": len(pages),
+                "ocr_pages": ocr_pages,
+                "missing_fields": missing_fields,
+                "extraction_method": "ocr" if len(ocr_pages) == len(pages) else "mixed" if ocr_pages else "text",
+                "is_scanned": all(check['kind'] == 'scanned' for check in preflight.values()),
+                "preflight": summarize_preflight(preflight),
+                # Tesseract languages picked from each OCR'd page's script
+                "ocr_langs": [{"page": page_no, **check['ocr_lang']}
+                              for page_no, check in sorted(preflight.items()) if 'ocr_lang' in check]
+            }
             # Add judgementOrder HTML for CKEditor
-            result['judgementOrder'] = extract_judgement_html_ck(pdf_path)
+            result['judgementOrder'] = extract_judgement_html_ck(pdf_path) if self.judgement_order else ''
             return result
             
         except Exception as e:
             logger.error(f"PDF extraction failed: {e}")
             return self._create_error_result(f"PDF extraction failed: {str(e)}")
 
+    def _read_pages(self, doc, page_numbers, ocr_settings: Dict, records: Dict, preflight: Dict) -> None:
+        """Add the PageRecords and preflight of `page_numbers` to `records` and `preflight`.
+
+        The preflight sorts the pages first, so every scanned or mixed page is
+        queued for OCR before the native ones are read. Each is OCR'd with the
+        languages of its script; the route's language is the fallback.
+        """
+        checks = preflight_pages(doc, page_numbers)
+        preflight.update(checks)
+        for record in iter_pages(doc, page_numbers=list(checks), ocr_fallback=OCR_AVAILABLE,
+                                 lang=ocr_settings['lang'], config=f"--psm {ocr_settings['psm']}",
+                                 preflight=checks, detect_lang=True):
+            if record.source == 'ocr':
+                lang = checks[record.page_no].get('ocr_lang', {}).get('lang', ocr_settings['lang'])
+                logger.info(f"Page {record.page_no} is {checks[record.page_no]['kind']}, used OCR ({lang})")
+            records[record.page_no] = record
+
+    def _read_metadata_pages(self, doc, ocr_settings: Dict, records: Dict, preflight: Dict) -> List[str]:
+        """Read the first and last pages (see _read_pages), widening while a field is missing.
+
+        Returns the fields still missing once every page is read.
+        """
+        page_count = len(doc)
+        window = self.metadata_window
+        while True:
+            head = range(1, min(window, page_count) + 1)
+            tail = range(max(page_count - window, 0) + 1, page_count + 1)
+            wanted = [page_no for page_no in dict.fromkeys([*head, *tail]) if page_no not in records]
+            self._read_pages(doc, wanted, ocr_settings, records, preflight)
+            text = ''.join(records[page_no].text + "\n" for page_no in sorted(records))
+            missing = [field for field, cue in METADATA_FIELD_CUES.items() if not cue.search(text)]
+            if not missing or len(records) == page_count:
+                return missing
+            logger.info(f"Metadata fields {missing} not in {len(records)} pages, reading more")
+            window += self.metadata_window
+
+    # Canonical mapping for result phrases
+    CASE_RESULT_MAP = [
+        ("dismissed", "Petition dismissed"),
+        ("allowed", "Petition allowed"),
+        ("disposed of", "Disposed of"),
+        ("order accordingly", "Order accordingly")
+    ]
+
+    def _find_case_result(self, pages: List[str]) -> Optional[str]:
+        """caseResult from the last 5 paragraphs, then the last 5 lines, searched last to first.
+
+        Pages are read from the end, only until they hold more than 5 of each:
+        the first paragraph of that tail may be cut at a page boundary, the
+        last 5 are whole, as in the full text.
+        """
+        if not pages:
+            return None
+        tail = []
+        for page_text in reversed(pages):
+            tail.insert(0, page_text + "\n")
+            text = ''.join(tail)
+            # Split into paragraphs (by double newlines or by period)
+            paragraphs = [p.strip() for p in re.split(r'\n\s*\n|(?<=\.)\s*\n', text) if p.strip()]
+            # Also check last 5 lines for extra robustness
+            lines = [l.strip() for l in text.split('\n') if l.strip()]
+            if len(paragraphs) > 5 and len(lines) > 5:
+                break
+        # Check last 5 paragraphs, then last 5 lines
+        search_blocks = paragraphs[-5:] + lines[-5:]
+        for block in search_blocks[::-1]:  # Search from last to first
+            block_lower = block.lower()
+            for key, canonical in self.CASE_RESULT_MAP:
+                if key in block_lower:
+                    return canonical
+        return None
+
     def _extract_from_image(self, image_path: str) -> Dict:
         """Extract text from image using OCR"""
         
@@ -217,34 +313,71 @@ class AILegalDocumentExtractor:
             return self._create_error_result("OCR not available - install pytesseract and PIL")
         
         try:
-            # Open image
-            img = Image.open(image_path)
-            
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # Every frame (multi-page TIFF scans), in grayscale, OCR'd in parallel and joined in order
+            ocr_settings = DEFAULT_ROUTE['ocr']
+            frames = [frame_text for _, frame_text in iter_ocr_frames(
+                image_path, lang=ocr_settings['lang'], config=f"--psm {ocr_settings['psm']}")]
+            text = "\n".join(frames)
             
-            # Extract text using OCR
-            text = pytesseract.image_to_string(img, config='--psm 6')
-            
-            logger.info(f"OCR extracted {len(text)} characters from image")
+            logger.info(f"OCR extracted {len(text)} characters from {len(frames)} image frame(s)")
             
             if not text.strip():
                 return self._create_error_result("No text found in image")
             
-            return self.extract_from_text(text)
+            return self.extract_from_text(text, classification=classify_text(text), pages=frames)
             
         except Exception as e:
             logger.error(f"Image OCR failed: {e}")
             return self._create_error_result(f"Image OCR failed: {str(e)}")
 
-    def extract_from_text(self, text: str, use_ai: bool = True) -> Dict:
-        """Extract all legal metadata using AI or regex"""
+    def extract_from_text(self, text: str, use_ai: bool = True, classification: Dict = None,
+                          pages: List[str] = None) -> Dict:
+        """Extract all legal metadata using AI or regex.
+
+        `classification` is the output of document_classifier.classify_text; its
+        route decides which extractors run and whether the LLM is called at all.
+        `pages` holds the raw per-page text (line breaks intact) for the
+        deterministic extractors that only look at part of a page.
+        """
         
         if not text or not text.strip():
             logger.error("No text content provided to extract_from_text")
             return self._create_error_result("No text content provided")
         
+        if classification is None:
+            classification = classify_text(text)
+        route = classification['route']
+        if route['prompt'] is None:
+            logger.info(f"No LLM prompt for {classification['document_type']} documents, using regex only")
+            use_ai = False
+        
+        if pages is None:
+            pages = [text]
+        
+        # Deterministic fields come straight from the layout, no LLM needed
+        deterministic = {}
+        if 'neutral_citation' in route['extractors']:
+            deterministic['neutral_citation'] = find_neutral_citation(pages)
+            logger.info(f"Deterministic neutral citation: {deterministic['neutral_citation']}")
+        if 'counsel' in route['extractors']:
+            deterministic['counsel'] = extract_counsel(pages)
+            logger.info(f"Deterministic counsel: {deterministic['counsel']}")
+        if 'decision_date' in route['extractors']:
+            deterministic['decision_date'] = extract_decision_date(pages)
+            logger.info(f"Deterministic decision date: {deterministic['decision_date']}")
+        if 'judge' in route['extractors']:
+            citation = deterministic.get('neutral_citation')
+            deterministic['judges'] = find_judges(pages, citation['citationCategory'] if citation else None)
+            logger.info(f"Gazetteer judges: {deterministic['judges']}")
+        
+        # Running headers/footers repeat on every page; keep one copy (first page)
+        # out of what the prompts and regexes see
+        if len(pages) > 1:
+            running = detect_running_lines(pages)
+            if running:
+                logger.info(f"Stripping {len(running)} running headers/footers from pages 2-{len(pages)}")
+                text = '\n'.join(strip_running_lines(pages, running))
+        
         # Clean and prepare text
         text = self._clean_text(text)
         
@@ -252,22 +385,30 @@ class AILegalDocumentExtractor:
         
         # Try to extract referred cases with AI if available
         case_referred = []
-        if use_ai and self.api_key and AI_AVAILABLE:
+        if 'case_referred' not in route['extractors']:
+            logger.info("Skipping case_referred extraction for this document type")
+        elif use_ai and self.api_key and AI_AVAILABLE:
             logger.info("Trying to extract referred cases with AI...")
             case_referred = self._extract_referred_cases_with_ai(text)
             logger.info(f"AI case_referred: {case_referred}")
-        if not case_referred:
+        if not case_referred and 'case_referred' in route['extractors']:
             logger.info("Falling back to regex for case_referred...")
             case_referred = self._extract_case_referred(text)
             logger.info(f"Regex case_referred: {case_referred}")
         
         # Try to extract judge name with AI if available
         judge_name = None
-        if use_ai and self.api_key and AI_AVAILABLE:
+        if 'judge' not in route['extractors']:
+            logger.info("Skipping judge extraction for this document type")
+            judge_name = "none"
+        elif deterministic.get('judges'):
+            judge_name = ', '.join(deterministic['judges']['judges'])
+            logger.info(f"Judge names from gazetteer, skipping AI: {judge_name}")
+        elif use_ai and self.api_key and AI_AVAILABLE:
             logger.info("Trying to extract judge name with AI...")
             judge_name = self._extract_judge_name_with_ai(text)
             logger.info(f"AI judge_name: {judge_name}")
-        if not judge_name or judge_name == "none":
+        if (not judge_name or judge_name == "none") and 'judge' in route['extractors']:
             logger.info("Falling back to regex for judge_name...")
             judge_name = self._extract_judge_regex(text)
             logger.info(f"Regex judge_name: {judge_name}")
@@ -290,6 +431,8 @@ class AILegalDocumentExtractor:
                 if ai_result and ai_result.get('success', False):
                     ai_result['caseReferred'] = case_referred
                     ai_result['judge_name'] = judge_name
+                    ai_result['extractionMetadata'] = self._build_extraction_metadata(classification)
+                    self._apply_deterministic_fields(ai_result, deterministic, from_ai=True)
                     logger.info("Returning AI extraction result.")
                     return ai_result
                 else:
@@ -300,9 +443,111 @@ class AILegalDocumentExtractor:
         result = self._extract_with_regex(text)
         result['caseReferred'] = case_referred
         result['judge_name'] = judge_name
+        result['extractionMetadata'] = self._build_extraction_metadata(classification)
+        self._apply_deterministic_fields(result, deterministic)
         logger.info(f"Regex extraction result: {result}")
         return result
 
+    def _apply_deterministic_fields(self, result: Dict, deterministic: Dict, from_ai: bool = False) -> None:
+        """Overlay fields found by the rule-based extractors onto an AI or regex result"""
+        citation = deterministic.get('neutral_citation')
+        if citation:
+            self._apply_neutral_citation(result, citation)
+        counsel = deterministic.get('counsel')
+        if counsel:
+            self._apply_counsel(result, counsel)
+        decision_date = deterministic.get('decision_date')
+        if decision_date:
+            self._apply_decision_date(result, decision_date)
+        judges = deterministic.get('judges')
+        if judges:
+            self._apply_judges(result, judges, from_ai)
+
+    def _apply_judges(self, result: Dict, judges: Dict, from_ai: bool = False) -> None:
+        """Fill judgeName and allJudges from the judge roster gazetteer.
+
+        An AI result that already names more judges is left as it is: the
+        gazetteer never replaces a bench with a shorter one.
+        """
+        existing = parse_formatted_judges((result.get('courtDetailRequest') or {}).get('allJudges'))
+        if from_ai and len(existing) > len(judges['judges']):
+            logger.info(f"Keeping allJudges {existing}: the gazetteer only found {judges['judges']}")
+            return
+        result['judgeName'] = judges['judgeName']
+        result['courtDetailRequest']['allJudges'] = judges['allJudges']
+        result['extractionMetadata']['judges'] = {
+            "names": judges['judges'],
+            "window": judges['window']
+        }
+
+    def _apply_decision_date(self, result: Dict, decision_date: Dict) -> None:
+        """Fill the decided day/month/year from the scored date candidates.
+
+        An accepted candidate replaces the LLM's decided_date; a low-scoring one
+        is still better than the fixed defaults of the regex fallback.
+        """
+        if decision_date['accepted'] or result.get('extraction_method') == 'Regex fallback':
+            history = result['caseHistoryRequest']
+            history['decidedDay'] = str(decision_date['day'])
+            history['decidedMonth'] = str(decision_date['month'])
+            history['decidedYear'] = decision_date['year']
+        result['extractionMetadata']['decision_date'] = {
+            "date": decision_date['date'],
+            "anchor": decision_date['anchor'],
+            "score": decision_date['score'],
+            "accepted": decision_date['accepted']
+        }
+
+    def _apply_counsel(self, result: Dict, counsel: Dict) -> None:
+        """Fill doubleCouncilDetailRequest from the rule-based counsel extractor.
+
+        Confident rule-based names win; otherwise they only fill sides the
+        current result left as "none".
+        """
+        council = result['doubleCouncilDetailRequest']
+        confident = counsel['confidence'] >= DETERMINISTIC_CONFIDENCE_THRESHOLD
+        for key in ('advocateForAppellant', 'advocateForRespondent'):
+            current = council.get(key)
+            if counsel[key] != 'none' and (confident or not current or current == 'none'):
+                council[key] = counsel[key]
+        result['extractionMetadata']['counsel'] = {"confidence": counsel['confidence']}
+
+    def _apply_neutral_citation(self, result: Dict, citation: Dict) -> None:
+        """Fill citationRequest from a parsed neutral citation and cross-check the court"""
+        result['citationRequest']['neutralCitation'] = citation['citation']
+        result['citationRequest']['year'] = citation['year']
+        
+        court_detail = result['courtDetailRequest']
+        expected_category = court_detail.get('citationCategory')
+        if not expected_category:
+            # Court not identified from the text, trust the court code in the citation
+            court_match = None
+            citation_court = self._map_court_info(citation['court_name'], None)
+            citation_court['allJudges'] = court_detail.get('allJudges', 'none')
+            result['courtDetailRequest'] = citation_court
+        else:
+            court_match = expected_category == citation['citationCategory']
+            if not court_match:
+                logger.warning(f"Neutral citation {citation['citation']} points to {citation['citationCategory']} "
+                               f"but the court was identified as {expected_category}")
+        
+        result['extractionMetadata']['neutral_citation'] = {
+            "citation": citation['citation'],
+            "court_code": citation['court_code'],
+            "court_match": court_match
+        }
+
+    def _build_extraction_metadata(self, classification: Dict) -> Dict:
+        """Summarise how the document was processed for the API response"""
+        return {
+            "document_type": {
+                "type": classification['document_type'],
+                "confidence": classification['confidence'],
+                "prompt": classification['route']['prompt'],
+                "extractors": classification['route']['extractors']
+            }
+        }
+
     def _chat_with_retry(self, messages: List[Dict], max_retries: int = None) -> Dict:
         """Execute OpenAI chat completion with improved exponential backoff retry logic"""
         max_retries = max_retries or self.max_retries
@@ -693,16 +938,7 @@ Return this exact JSON structure:
         # Split by comma for multiple judges, strip whitespace
         judge_names = [j.strip() for j in raw_judge.split(',') if j.strip()] if raw_judge and raw_judge != 'none' else []
         
-        if len(judge_names) > 1:
-            # Multiple judges
-            formatted_all_judges = ', '.join([f"Hon'ble {j}" for j in judge_names]) + " JJ."
-            formatted_judge_name = f"Hon'ble {judge_names[0]} J."
-        elif len(judge_names) == 1:
-            formatted_all_judges = f"Hon'ble {judge_names[0]} J."
-            formatted_judge_name = f"Hon'ble {judge_names[0]} J."
-        else:
-            formatted_all_judges = 'none'
-            formatted_judge_name = 'none'
+        formatted_judge_name, formatted_all_judges = format_judges(judge_names)
         
         # Map court information
         court_info = self._map_court_info(ai_data.get('court_name', ''), None)
@@ -867,6 +1103,9 @@ Return this exact JSON structure:
         judge = self._extract_judge_regex(text)
         case_info = self._extract_case_info_regex(text)
         case_referred = self._extract_case_referred(text)
+        court_name = self._extract_court_name_regex(text)
+        court_info = self._map_court_info(court_name, None)
+        court_info['allJudges'] = judge
         
         return {
             "docId": 0,
@@ -883,13 +1122,7 @@ Return this exact JSON structure:
                 "extraCouncilDetails": "none"
             },
             "singleCouncilDetailRequest": None,
-            "courtDetailRequest": {
-                "allJudges": judge,
-                "courtBenchId": 1,
-                "courtBranchId": "34",
-                "courtId": 1,
-                "citationCategory": ""
-            },
+            "courtDetailRequest": court_info,
             "citationRequest": {
                 "citationCategoryId": 0,
                 "journalId": 0,
@@ -981,6 +1214,21 @@ Return this exact JSON structure:
                 return group
         return "Respondents"
 
+    def _extract_court_name_regex(self, text: str) -> str:
+        """Find the court name in the opening part of the document.
+
+        Takes a heading line: "IN THE HIGH COURT OF X ..." (or "HIGH COURT
+        OF X ...") up to the end of the line, or "X High Court [at Y]"; both
+        resolve in _map_court_info. Mentions inside sentences are skipped.
+        """
+        match = re.search(
+            r'SUPREME\s+COURT\s+OF\s+INDIA'
+            r'|^[ \t]*(?:IN\s+THE\s+)?HIGH\s+COURT\s+OF\b[^\n]*'
+            r'|^[ \t]*(?-i:[A-Z])[A-Za-z&.\' \t]{0,40}\bHIGH\s+COURT\b(?:[ \t]+(?:AT|OF)\b[^\n]{0,40})?[ \t]*$',
+            text[:3000], re.IGNORECASE | re.MULTILINE
+        )
+        return match.group(0).strip() if match else ""
+
     def _extract_judge_regex(self, text: str) -> str:
         """Basic regex judge extraction"""
         patterns = [
@@ -1261,6 +1509,11 @@ def main():
             print("  python legal_document_extractor_simple.py --check-api")
             print("  python legal_document_extractor_simple.py --regex-only <file>")
             print("  python legal_document_extractor_simple.py --no-ai <file>")
+            print("  python legal_document_extractor_simple.py --judgement-order <file.pdf>")
+            print("\nOptions:")
+            print("  --no-judgement-order   Leave judgementOrder empty in --pdf/--file results")
+            print("  --metadata-only        Read only the first and last pages of a PDF, and more")
+            print("                         only while a metadata field is missing")
             print("\nEnvironment:")
             print("  Set OPENAI_API_KEY=your_api_key")
             print("\nDependencies:")
@@ -1275,8 +1528,19 @@ def main():
             print("  - Smart rate limit detection")
             sys.exit(0)
         
+        # Judgement/order HTML only, written to stdout as is
+        if '--judgement-order' in sys.argv:
+            html_index = sys.argv.index('--judgement-order')
+            if html_index + 1 >= len(sys.argv):
+                print("No PDF path provided", file=sys.stderr)
+                sys.exit(1)
+            sys.stdout.write(extract_judgement_html_ck(sys.argv[html_index + 1]))
+            sys.exit(0)
+
         # Initialize extractor with custom retry settings
-        extractor = AILegalDocumentExtractor(max_retries=2)
+        extractor = AILegalDocumentExtractor(max_retries=2,
+                                             judgement_order='--no-judgement-order' not in sys.argv,
+                                             metadata_only='--metadata-only' in sys.argv)
         
         # Check API status if requested
         if '--check-api' in sys.argv:
@@ -1375,7 +1639,8 @@ The petition is dismissed."""
         
         # Output result as JSON
         try:
-            print(json.dumps(result, ensure_ascii=False, indent=2))
+            # Compact separators: the judgementOrder HTML makes this payload large
+            print(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
         except Exception as json_err:
             print(f"JSON output error: {json_err}", file=sys.stderr)
             sys.exit(1)
@@ -1400,69 +1665,122 @@ if __name__ == "__main__" and '--test-sample' in sys.argv:
     print("Respondent:", extractor._extract_respondent_regex(sample_text))
     print("Case Info:", extractor._extract_case_info_regex(sample_text))
 
+JUDGEMENT_HEADINGS = ["judgment", "judgement", "order"]
+
 def extract_judgement_html(pdf_path):
     import fitz
     doc = fitz.open(pdf_path)
     found_heading = False
-    html_content = ""
+    html_parts = []
     for page in doc:
+        if not found_heading:
+            # Pages without a heading word are skipped before rendering their
+            # HTML; the plain text layer is far cheaper than either
+            page_text = page.get_text().lower()
+            if not any(heading in page_text for heading in JUDGEMENT_HEADINGS):
+                continue
         html = page.get_text("html")
         lower_html = html.lower()
         if not found_heading:
             idx = -1
-            for heading in ["judgment", "judgement", "order"]:
+            for heading in JUDGEMENT_HEADINGS:
                 idx = lower_html.find(heading)
                 if idx != -1:
                     break
             if idx != -1:
                 found_heading = True
-                html_content += html[idx:]
+                html_parts.append(html[idx:])
         elif found_heading:
-            html_content += html
+            html_parts.append(html)
     doc.close()
+    html_content = ''.join(html_parts)
     if found_heading and html_content.strip():
         return html_content
     # Fallback: OCR for scanned PDFs
     return extract_judgement_html_ocr(pdf_path)
 
+# fitz span flag for italic text (bold comes from is_bold)
+ITALIC_FLAG = 2
+# Spans starting right of this share of the page width right-align their block
+RIGHT_ALIGN_RATIO = 0.6
+# Plain spaces are kept; the wrapper tells the editor not to collapse them
+JUDGEMENT_HTML_OPEN = '<div style="white-space:pre-wrap">'
+JUDGEMENT_HTML_CLOSE = '</div>'
+
+
+def _judgement_line_html(runs: List[tuple]) -> str:
+    """Inner HTML of one line from (bold, italic, escaped text) spans.
+
+    Adjacent spans in the same style share one <strong>/<em> wrapper.
+    """
+    parts = []
+    style, pieces = None, []
+    for bold, italic, text in runs + [(None, None, '')]:
+        if (bold, italic) != style:
+            if pieces:
+                inner = ''.join(pieces)
+                if style[1]:
+                    inner = f'<em>{inner}</em>'
+                if style[0]:
+                    inner = f'<strong>{inner}</strong>'
+                parts.append(inner)
+            style, pieces = (bold, italic), []
+        pieces.append(text)
+    return ''.join(parts)
+
+
 def extract_judgement_html_ck(pdf_path):
     import fitz
     doc = fitz.open(pdf_path)
+    # Span texts repeat a lot (spaces, punctuation, names); each distinct text
+    # is interned once and escaped once, and each font checked for bold once
+    strings = StringTable()
+    escaped = {}
+    bold_fonts = {}
     found_heading = False
-    html_content = ""
+    parts = []
     for page in doc:
-        blocks = page.get_text("dict")["blocks"]
-        for block in blocks:
-            block_text = ""
-            block_align = None
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    text = span["text"].replace(" ", "&nbsp;")
-                    # Detect heading
-                    if not found_heading and ("judgment" in text.lower() or "judgement" in text.lower() or "order" in text.lower()):
-                        found_heading = True
-                    elif found_heading:
-                        # Style detection
-                        style = ""
-                        if span.get("flags", 0) & 2:  # bold
-                            text = f"<strong>{text}</strong>"
-                        if span.get("flags", 0) & 8:  # italic
-                            text = f"<em>{text}</em>"
-                        # Alignment
-                        if span.get("origin", [0, 0])[0] > page.rect.width * 0.6:
-                            block_align = "right"
-                        block_text += text
-                if found_heading and block_text:
-                    if block_align == "right":
-                        html_content += f'<div style="text-align:right">{block_text}</div>'
-                    else:
-                        html_content += f'<div>{block_text}</div>'
-                    block_text = ""
-            if found_heading and html_content.strip():
-                # Optionally, stop if we reach another major heading (not implemented for simplicity)
-                pass
+        spans = PageSpans.from_page(page, strings)
+        blocks = spans.block.tolist()
+        lines = spans.line.tolist()
+        fonts = spans.font.tolist()
+        flags = spans.flags.tolist()
+        italic = (spans.flags & ITALIC_FLAG).astype(bool).tolist()
+        # Alignment
+        right = (spans.origin_x > page.rect.width * RIGHT_ALIGN_RATIO).tolist()
+        runs = []
+        block_align = None
+        for i, text_id in enumerate(spans.text.tolist()):
+            if i and blocks[i] != blocks[i - 1]:
+                block_align = None
+            # Detect heading
+            if not found_heading:
+                lower_text = strings[text_id].lower()
+                if any(heading in lower_text for heading in JUDGEMENT_HEADINGS):
+                    found_heading = True
+            else:
+                text = escaped.get(text_id)
+                if text is None:
+                    text = escaped[text_id] = escape(strings[text_id], quote=False)
+                bold = bold_fonts.get((fonts[i], flags[i]))
+                if bold is None:
+                    bold = bold_fonts[fonts[i], flags[i]] = is_bold(strings[fonts[i]], flags[i])
+                if right[i]:
+                    block_align = "right"
+                runs.append((bold, italic[i], text))
+            # One <div> per line
+            if runs and (i + 1 == len(lines) or lines[i + 1] != lines[i]):
+                if block_align == "right":
+                    parts.append('<div style="text-align:right">')
+                else:
+                    parts.append('<div>')
+                parts.append(_judgement_line_html(runs))
+                parts.append('</div>')
+                runs = []
     doc.close()
-    return html_content if found_heading else ""
+    if not found_heading:
+        return ""
+    return JUDGEMENT_HTML_OPEN + ''.join(parts) + JUDGEMENT_HTML_CLOSE
 
 # CLI entry point for extracting judgement/order section as HTML
 if __name__ == "__main__" and '--extract-judgement-html' in sys.argv:
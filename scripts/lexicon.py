@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Packed English Lexicon
+======================
+
+Word lookups for pdf_parser's dictionary normalization without building a
+236k-entry Python set in every process:
+
+- The word list (NLTK "words" corpus plus legal_vocabulary.txt) is
+  de-duplicated, sorted and packed into english_lexicon.bin as one fixed-width
+  byte string per word
+- The file is memory-mapped read-only on the first lookup, so worker processes
+  share one copy in the OS page cache instead of each holding its own set
+- Membership is a binary search (numpy searchsorted) over the mapped array
+- The file is built ahead of time, once per deployment, with
+  `python lexicon.py --build`: building is the only step that needs NLTK
+  and may download its corpus. A request never builds it; a missing file is
+  an error, and one older than legal_vocabulary.txt only a warning
+- normalize_text undoes OCR letter doubling ("Courtt" -> "Court") one
+  distinct token at a time: results are kept in a per-process LRU cache, so
+  "the", "Court" and "petitioner" are only looked up once
+
+Usage:
+    python lexicon.py --build [wordlist.txt ...]
+    python lexicon.py --benchmark [wordlist.txt]
+    python lexicon.py --benchmark-normalize <file.txt|file.pdf> [...]
+    python lexicon.py <word> [...]
+"""
+
+import sys
+import os
+import json
+import mmap
+import struct
+import logging
+import re
+import subprocess
+import time
+from functools import lru_cache
+from itertools import groupby
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LEXICON_PATH = os.environ.get('LEXICON_PATH', os.path.join(SCRIPT_DIR, 'english_lexicon.bin'))
+LEGAL_VOCABULARY_PATH = os.path.join(SCRIPT_DIR, 'legal_vocabulary.txt')
+
+# Magic, word count, bytes per word; the words follow, null padded
+HEADER = struct.Struct('<8sII')
+MAGIC = b'LEXICON1'
+
+# Distinct tokens whose normalization each process remembers
+NORMALIZE_CACHE_SIZE = 65536
+# Deletes every ASCII character but the letters; non-ASCII is dropped before
+NON_LETTERS = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isalpha()))
+
+
+class Lexicon:
+    """Read-only word set backed by a memory-mapped english_lexicon.bin."""
+
+    __slots__ = ('path', 'width', 'words', '_map')
+
+    def __init__(self, path: str = LEXICON_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, width = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"Not a lexicon file: {path}")
+        self.width = width
+        self.words = np.frombuffer(self._map, dtype=f'S{width}', count=count, offset=HEADER.size)
+
+    def __contains__(self, word: str) -> bool:
+        key = word.encode('utf-8')
+        if not key or len(key) > self.width:
+            return False
+        index = int(self.words.searchsorted(key))
+        return index < len(self.words) and self.words[index] == key
+
+    def __len__(self):
+        return len(self.words)
+
+
+def build_lexicon(words: Iterable[str], path: str = LEXICON_PATH) -> int:
+    """Pack `words` into a lexicon file; returns the number of distinct words."""
+    keys = sorted({word.encode('utf-8') for word in words if word})
+    width = max(map(len, keys), default=1)
+    packed = np.array(keys, dtype=f'S{width}')
+    # Written aside and renamed, so processes mapping the old file keep it intact
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(keys), width))
+        f.write(packed.tobytes())
+    os.replace(tmp_path, path)
+    logger.info(f"Built lexicon with {len(keys)} words at {path}")
+    return len(keys)
+
+
+def load_vocabulary(path: str) -> List[str]:
+    """Words of a one-word-per-line list; blank lines and '#' comments are skipped."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def corpus_words() -> List[str]:
+    """The NLTK "words" corpus, downloading it on first use."""
+    import nltk
+    from nltk.corpus import words
+    try:
+        return words.words()
+    except LookupError:
+        nltk.download('words', quiet=True)
+        return words.words()
+
+
+def _is_stale(path: str) -> bool:
+    if not os.path.exists(path):
+        return True
+    return os.path.getmtime(path) < os.path.getmtime(LEGAL_VOCABULARY_PATH)
+
+
+_lexicon = None
+
+
+def get_lexicon() -> Lexicon:
+    """The process-wide lexicon, mapped on first use.
+
+    Raises FileNotFoundError when english_lexicon.bin has not been built.
+    """
+    global _lexicon
+    if _lexicon is None:
+        if not os.path.exists(LEXICON_PATH):
+            raise FileNotFoundError(f"Lexicon not found at {LEXICON_PATH}: "
+                                    f"build it with `python scripts/lexicon.py --build`")
+        if _is_stale(LEXICON_PATH):
+            logger.warning(f"{LEXICON_PATH} is older than {LEGAL_VOCABULARY_PATH}; "
+                           f"rebuild it with `python scripts/lexicon.py --build`")
+        _lexicon = Lexicon(LEXICON_PATH)
+    return _lexicon
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_token(token: str) -> str:
+    """One whitespace-separated token, normalized.
+
+    The token is kept when its letters form a dictionary word. Otherwise its
+    letters with repeated runs collapsed ("Courtt" -> "Court") are returned if
+    they form one, and the token as is when they do not.
+    """
+    if token.isascii():
+        letters = token if token.isalpha() else token.translate(NON_LETTERS)
+    else:
+        letters = token.encode('ascii', 'ignore').decode('ascii').translate(NON_LETTERS)
+    english_words = get_lexicon()
+    if letters.lower() in english_words:
+        return token
+    collapsed = ''.join(letter for letter, _ in groupby(letters))
+    if collapsed != letters and collapsed.lower() in english_words:
+        return collapsed
+    return token
+
+
+def normalize_text(text: str) -> str:
+    """Normalize every token of `text`; tokens end up joined by single spaces."""
+    return ' '.join(map(normalize_token, text.split()))
+
+
+def _normalize_text_per_token(text: str) -> str:
+    """The former pdf_parser implementation: two regexes and lookups per token."""
+    english_words = get_lexicon()
+
+    def process_word(word):
+        word_alpha = re.sub(r'[^a-zA-Z]', '', word)
+        if word_alpha.lower() in english_words:
+            return word
+        norm = re.sub(r'(\w)\1+', r'\1', word_alpha)
+        if norm.lower() in english_words:
+            return norm
+        return word
+    return ' '.join(process_word(w) for w in text.split())
+
+
+def benchmark_normalize(paths: List[str]) -> Dict:
+    """Throughput of normalize_text against the per-token implementation, in MB/s."""
+    texts = []
+    for path in paths:
+        if path.lower().endswith('.pdf'):
+            import fitz  # PyMuPDF
+            with fitz.open(path) as doc:
+                texts.append('\n'.join(page.get_text() for page in doc))
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                texts.append(f.read())
+    text = '\n'.join(texts)
+    size_mb = len(text.encode('utf-8')) / 1e6
+    get_lexicon()
+
+    results = {'size_mb': round(size_mb, 2), 'tokens': len(text.split())}
+    start = time.perf_counter()
+    expected = _normalize_text_per_token(text)
+    results['per_token_mb_s'] = round(size_mb / (time.perf_counter() - start), 2)
+    normalize_token.cache_clear()
+    start = time.perf_counter()
+    normalized = normalize_text(text)
+    results['cold_cache_mb_s'] = round(size_mb / (time.perf_counter() - start), 2)
+    start = time.perf_counter()
+    normalize_text(text)
+    results['warm_cache_mb_s'] = round(size_mb / (time.perf_counter() - start), 2)
+    results['distinct_tokens'] = normalize_token.cache_info().currsize
+    results['identical_output'] = normalized == expected
+    return results
+
+
+def _memory_kb() -> Dict[str, int]:
+    """Resident memory of this process: private (anonymous) and file-backed."""
+    memory = {}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        import resource
+        memory['VmRSS'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return memory
+
+
+def _measure(mode: str, wordlist: str = None) -> Dict:
+    """Startup, memory and lookup cost of one approach, in this (fresh) process."""
+    # Lookups as dictionary_normalize_text makes them: lower-cased, half misses.
+    # The sample comes from a mapping that is closed again before measuring.
+    sample = [word.decode('utf-8').lower() for word in Lexicon().words[::7].tolist()]
+    sample += [word + 'xq' for word in sample]
+
+    before = _memory_kb()
+    start = time.perf_counter()
+    if mode == 'set':
+        # What pdf_parser used to do at import
+        english_words = set(load_vocabulary(wordlist) if wordlist else corpus_words())
+    else:
+        english_words = Lexicon()
+    startup = time.perf_counter() - start
+    loaded = _memory_kb()
+
+    start = time.perf_counter()
+    hits = sum(1 for word in sample if word in english_words)
+    lookup = time.perf_counter() - start
+    looked_up = _memory_kb()
+
+    return {
+        'mode': mode,
+        'words': len(english_words),
+        'startup_ms': round(startup * 1000, 1),
+        'lookups': len(sample),
+        'hits': hits,
+        'lookup_us': round(lookup / len(sample) * 1e6, 2),
+        'rss_after_startup_mb': {key: round((loaded[key] - before[key]) / 1024, 1) for key in loaded},
+        'rss_after_lookups_mb': {key: round((looked_up[key] - before[key]) / 1024, 1) for key in looked_up},
+    }
+
+
+def benchmark(wordlist: str = None) -> List[Dict]:
+    """Compare the old per-process set with the mapped lexicon, each in a fresh interpreter."""
+    if _is_stale(LEXICON_PATH):
+        words = load_vocabulary(wordlist) if wordlist else corpus_words()
+        build_lexicon(words + load_vocabulary(LEGAL_VOCABULARY_PATH))
+    results = []
+    for mode in ('set', 'mmap'):
+        args = [sys.executable, os.path.abspath(__file__), '--measure', mode] + ([wordlist] if wordlist else [])
+        output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output))
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python lexicon.py [--build [wordlist.txt ...] | --benchmark [wordlist.txt] | "
+              "--benchmark-normalize <file> [...]] <word> [...]", file=sys.stderr)
+        sys.exit(1)
+    if args[0] == '--build':
+        words = [word for path in args[1:] for word in load_vocabulary(path)] if args[1:] else corpus_words()
+        count = build_lexicon(words + load_vocabulary(LEGAL_VOCABULARY_PATH))
+        print(json.dumps({'path': LEXICON_PATH, 'words': count}, indent=2))
+        return
+    if args[0] == '--benchmark':
+        print(json.dumps(benchmark(args[1] if len(args) > 1 else None), indent=2))
+        return
+    if args[0] == '--benchmark-normalize':
+        print(json.dumps(benchmark_normalize(args[1:]), indent=2))
+        return
+    if args[0] == '--measure':
+        print(json.dumps(_measure(args[1], args[2] if len(args) > 2 else None)))
+        return
+    lexicon = get_lexicon()
+    print(json.dumps({word: word in lexicon for word in args}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
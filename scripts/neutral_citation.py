@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Deterministic Neutral Citation Parser
+=====================================
+
+Parses Indian neutral citations without calling the LLM:
+
+- High Courts:   2025:AHC-LKO:26557-DB, 2023:BHC-NAG:12345, 2025:MHC:1515,
+                 2024:RJ-JD:1234, 2024:KER:12345, 2024:PHHC:012345
+- Supreme Court: 2023 INSC 123, 2023:INSC:123
+
+Neutral citations are printed in the header or footer of the first pages, so
+only those bands are scanned instead of the whole document.
+"""
+
+import sys
+import re
+import json
+from typing import Dict, List, Optional
+
+# Only the first pages carry the neutral citation
+MAX_PAGES = 2
+# Number of non-empty lines taken from the top and bottom of each page
+BAND_LINES = 8
+
+# Court code -> (citation category used by _map_court_info, court name that
+# _map_court_info resolves to the same court)
+CITATION_COURTS = {
+    'INSC': ('SC', 'Supreme Court of India'),
+    'AHC': ('All', 'High Court of Judicature at Allahabad'),
+    'APHC': ('AP', 'High Court of Andhra Pradesh'),
+    'BHC': ('Bom', 'High Court of Judicature at Bombay'),
+    'CHC': ('Cal', 'High Court at Calcutta'),
+    'CGHC': ('Chh', 'High Court of Chhattisgarh'),
+    'DHC': ('Del', 'High Court of Delhi'),
+    'GAU': ('Gau', 'Gauhati High Court'),
+    'GAHC': ('Gau', 'Gauhati High Court'),
+    'GUJHC': ('Guj', 'High Court of Gujarat'),
+    'HHC': ('HP', 'High Court of Himachal Pradesh'),
+    'JKLHC': ('J&K', 'High Court of Jammu & Kashmir'),
+    'JHHC': ('Jhar', 'High Court of Jharkhand'),
+    'KHC': ('Kar', 'High Court of Karnataka'),
+    'KER': ('Ker', 'High Court of Kerala'),
+    'MPHC': ('MP', 'High Court of Madhya Pradesh'),
+    'MHC': ('Mad', 'High Court of Madras'),
+    'MNHC': ('Mani', 'High Court of Manipur'),
+    'MLHC': ('Megh', 'High Court of Meghalaya'),
+    'OHC': ('Ori', 'High Court of Orissa'),
+    'ORHC': ('Ori', 'High Court of Orissa'),
+    'PHC': ('Pat', 'High Court of Judicature at Patna'),
+    'PHHC': ('P&H', 'High Court of Punjab and Haryana'),
+    'RJ': ('Raj', 'High Court of Judicature for Rajasthan'),
+    'SHC': ('Sikk', 'High Court of Sikkim'),
+    'TSHC': ('Tel', 'High Court for the State of Telangana'),
+    'THC': ('Tri', 'High Court of Tripura'),
+    'UHC': ('Utt', 'High Court of Uttarakhand'),
+}
+
+_COURT_CODES = '|'.join(sorted(CITATION_COURTS, key=len, reverse=True))
+
+# YEAR:COURT[-BENCH]:NUMBER[-SUFFIX]
+COLON_CITATION_RE = re.compile(
+    r'(?<![\d:])(?P<year>(?:19|20)\d{2})\s*:\s*'
+    rf'(?P<court>{_COURT_CODES})(?:\s*-\s*(?P<bench>[A-Z]{{1,4}}))?\s*:\s*'
+    r'(?P<number>\d{1,7})(?:\s*-\s*(?P<suffix>[A-Z]{1,3})\b)?'
+)
+
+# YEAR INSC NUMBER (Supreme Court)
+INSC_CITATION_RE = re.compile(r'(?<!\d)(?P<year>(?:19|20)\d{2})\s+(?P<court>INSC)\s+(?P<number>\d{1,6})\b')
+
+
+def _format_match(match: re.Match) -> Dict:
+    """Build the canonical citation record for a grammar match."""
+    parts = match.groupdict()
+    court = parts['court']
+    if match.re is INSC_CITATION_RE:
+        citation = f"{parts['year']} INSC {parts['number']}"
+    else:
+        citation = f"{parts['year']}:{court}"
+        if parts.get('bench'):
+            citation += f"-{parts['bench']}"
+        citation += f":{parts['number']}"
+        if parts.get('suffix'):
+            citation += f"-{parts['suffix']}"
+    category, court_name = CITATION_COURTS[court]
+    return {
+        'citation': citation,
+        'year': int(parts['year']),
+        'court_code': court,
+        'bench': parts.get('bench'),
+        'number': parts['number'],
+        'suffix': parts.get('suffix'),
+        'citationCategory': category,
+        'court_name': court_name,
+    }
+
+
+def parse_neutral_citation(text: str) -> Optional[Dict]:
+    """Return the first neutral citation found in text, or None."""
+    if not text:
+        return None
+    matches = [m for m in (COLON_CITATION_RE.search(text), INSC_CITATION_RE.search(text)) if m]
+    if not matches:
+        return None
+    return _format_match(min(matches, key=lambda m: m.start()))
+
+
+def citation_bands(pages: List[str], max_pages: int = MAX_PAGES, band_lines: int = BAND_LINES) -> str:
+    """Join the header and footer bands of the first pages."""
+    bands = []
+    for page_text in pages[:max_pages]:
+        lines = [line.strip() for line in page_text.split('\n') if line.strip()]
+        if len(lines) <= 2 * band_lines:
+            bands.extend(lines)
+        else:
+            bands.extend(lines[:band_lines])
+            bands.extend(lines[-band_lines:])
+    return '\n'.join(bands)
+
+
+def find_neutral_citation(pages: List[str], max_pages: int = MAX_PAGES, band_lines: int = BAND_LINES) -> Optional[Dict]:
+    """Find the neutral citation in the header/footer bands of the first pages."""
+    return parse_neutral_citation(citation_bands(pages, max_pages, band_lines))
+
+
+def main():
+    """Print the neutral citation found in each PDF or text file."""
+    if len(sys.argv) < 2:
+        print("Usage: python neutral_citation.py <file.pdf|file.txt> [...]", file=sys.stderr)
+        sys.exit(1)
+
+    results = {}
+    for path in sys.argv[1:]:
+        if path.lower().endswith('.pdf'):
+            import fitz  # PyMuPDF
+            with fitz.open(path) as doc:
+                pages = [doc[i].get_text() for i in range(min(MAX_PAGES, len(doc)))]
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages = f.read().split('\f')
+        results[path] = find_neutral_citation(pages)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+OCR Page Cache
+==============
+
+Remembers the Tesseract text of every page image already read, so
+re-uploads and PDFs that share pages (the same scan with a new stamped first
+page, say) skip Tesseract for the pages seen before:
+
+- The key is a SHA-256 of the rendered grayscale page pixels, their size, the
+  render DPI, the Tesseract language, config and version: a page only hits
+  when Tesseract would be given the very same input
+- Entries live in one SQLite file (WAL mode), shared by every worker process
+  on the machine; a forked worker process opens its own connection
+- The file is bounded: once the cached texts exceed OCR_CACHE_MAX_MB, the
+  least recently used entries are evicted
+- OCR_CACHE_PATH="" turns the cache off
+
+Usage:
+    python ocr_cache.py --stats
+    python ocr_cache.py --clear
+"""
+
+import sys
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OCR_CACHE_PATH = os.environ.get('OCR_CACHE_PATH', os.path.join(SCRIPT_DIR, 'ocr_cache.sqlite3'))
+# Bytes of cached text (UTF-8) kept before evicting; about 3 KB per page
+OCR_CACHE_MAX_MB = float(os.environ.get('OCR_CACHE_MAX_MB', 256))
+# Evictions go down to this share of the bound, so they do not run on every insert
+EVICT_TO_RATIO = 0.9
+# Milliseconds a worker waits for another one's write to finish
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key BLOB PRIMARY KEY,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pages_used ON pages (used);
+"""
+
+
+def page_key(samples, width: int, height: int, dpi: int, lang: str, config: str, engine: str = '') -> bytes:
+    """Cache key of one rendered page image and the Tesseract settings it is read with."""
+    digest = hashlib.sha256(samples)
+    digest.update(f'\0{width}x{height}\0{dpi}\0{lang}\0{config}\0{engine}'.encode('utf-8'))
+    return digest.digest()
+
+
+class OcrCache:
+    """Page image key -> OCR text, in a size-bounded SQLite file."""
+
+    def __init__(self, path: str = OCR_CACHE_PATH, max_mb: float = OCR_CACHE_MAX_MB):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # Autocommit: every statement is its own short transaction
+        self._db = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._size = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Cached text of `key`, marking it recently used; None on a miss."""
+        row = self._db.execute('SELECT text FROM pages WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute('UPDATE pages SET used = ? WHERE key = ?', (time.time(), key))
+        return row[0]
+
+    def put(self, key: bytes, text: str) -> None:
+        size = len(text.encode('utf-8'))
+        self._db.execute('INSERT OR REPLACE INTO pages (key, text, size, used) VALUES (?, ?, ?, ?)',
+                         (key, text, size, time.time()))
+        # Other workers insert too: this running total only decides when to
+        # look at the real one
+        self._size += size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries down to EVICT_TO_RATIO of the bound; returns how many."""
+        deleted = self._db.execute(
+            'DELETE FROM pages WHERE key IN (SELECT key FROM ('
+            'SELECT key, SUM(size) OVER (ORDER BY used DESC) AS kept FROM pages) WHERE kept > ?)',
+            (int(self.max_bytes * EVICT_TO_RATIO),)).rowcount
+        self._size = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        if deleted:
+            logger.info(f"Evicted {deleted} pages from the OCR cache")
+        return deleted
+
+    def clear(self) -> None:
+        self._db.execute('DELETE FROM pages')
+        self._db.execute('VACUUM')
+        self._size = 0
+
+    def stats(self) -> Dict:
+        pages, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages').fetchone()
+        return {'path': self.path, 'pages': pages, 'text_mb': round(size / 1024 / 1024, 2),
+                'max_mb': round(self.max_bytes / 1024 / 1024, 2)}
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_cache = False
+# Process the cache was opened in: a forked worker must open its own
+_cache_pid = None
+# Connections inherited through fork(), kept so they are never closed (or
+# used) in the child: closing one could checkpoint the parent's WAL
+_inherited = []
+
+
+def get_ocr_cache() -> Optional[OcrCache]:
+    """The process-wide cache, opened on first use; None when turned off or not openable."""
+    global _cache, _cache_pid
+    if _cache_pid != os.getpid():
+        if _cache:
+            _inherited.append(_cache)
+        _cache = False
+        _cache_pid = os.getpid()
+    if _cache is False:
+        _cache = None
+        if OCR_CACHE_PATH:
+            try:
+                _cache = OcrCache()
+            except sqlite3.Error as e:
+                logger.warning(f"OCR cache not available at {OCR_CACHE_PATH}: {e}")
+    return _cache
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('--stats', '--clear'):
+        print("Usage: python ocr_cache.py [--stats | --clear]", file=sys.stderr)
+        sys.exit(1)
+    cache = get_ocr_cache()
+    if cache is None:
+        print("OCR cache is turned off (OCR_CACHE_PATH is empty)", file=sys.stderr)
+        sys.exit(1)
+    if sys.argv[1] == '--clear':
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Streaming Page OCR
+==================
+
+OCRs a PDF one page at a time instead of rendering the whole document into
+PIL images first (pdf2image's convert_from_path holds every page in memory;
+a 200-page scan at 200 DPI takes gigabytes):
+
+- fitz renders a single page, in grayscale, straight into a pixmap; nothing
+  else is held while Tesseract reads it
+- A memory ceiling caps each page image: pages that would exceed it at the
+  requested DPI are rendered at the highest DPI that fits
+- iter_ocr_pages is a generator of (page number, text), so memory stays flat
+  as the page count grows and callers can work on early pages while later
+  ones are still being read
+- Pages whose rendered image was read before come from the OCR cache
+  (ocr_cache.py) without running Tesseract
+- OcrQueue OCRs pages known to need it (page_preflight.py) in a pool of
+  worker processes while the caller goes through the other pages, picking
+  each page's languages from its script if asked (page_script.py)
+- iter_ocr_frames does the same for the frames of an image file (multi-page
+  TIFF scans): frames are decoded one by one, in grayscale, and only as
+  many are held as there are OCR threads
+
+Usage:
+    python ocr_pages.py <file.pdf> [first_page] [last_page]
+    python ocr_pages.py <image file>
+"""
+
+import sys
+import os
+import math
+import logging
+import sqlite3
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from ocr_cache import get_ocr_cache, page_key
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pytesseract
+    from PIL import Image
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+# pdf2image's default, which pdf_parser OCR'd at: Tesseract time and image
+# memory grow with the square of the DPI
+OCR_DPI = 200
+# Lowest DPI a page is rendered at, whatever the ceiling
+MIN_OCR_DPI = 100
+# Largest page image, in MB; a grayscale A4 page at 200 DPI is about 3.7 MB
+MAX_PAGE_IMAGE_MB = float(os.environ.get('OCR_MAX_PAGE_IMAGE_MB', 32))
+# Worker processes of an OcrQueue; each holds one page image at a time
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def page_dpi(page, dpi: int = OCR_DPI, max_image_mb: float = MAX_PAGE_IMAGE_MB) -> int:
+    """`dpi`, lowered until a grayscale render of `page` fits in `max_image_mb`."""
+    width_in, height_in = page.rect.width / 72, page.rect.height / 72
+    pixels = width_in * height_in * dpi * dpi
+    budget = max_image_mb * 1024 * 1024
+    if pixels <= budget:
+        return dpi
+    return max(MIN_OCR_DPI, int(dpi * math.sqrt(budget / pixels)))
+
+
+def render_pixmap(page, dpi: int = OCR_DPI, max_image_mb: float = MAX_PAGE_IMAGE_MB):
+    """One fitz page as a grayscale pixmap within the memory ceiling."""
+    import fitz  # PyMuPDF
+
+    return page.get_pixmap(dpi=page_dpi(page, dpi, max_image_mb), colorspace=fitz.csGRAY, alpha=False)
+
+
+def render_page(page, dpi: int = OCR_DPI, max_image_mb: float = MAX_PAGE_IMAGE_MB) -> 'Image.Image':
+    """One fitz page as a grayscale PIL image within the memory ceiling."""
+    pix = render_pixmap(page, dpi, max_image_mb)
+    return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+@lru_cache(maxsize=1)
+def tesseract_version() -> str:
+    """Version of the Tesseract binary: another version may read a page differently."""
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return ''
+
+
+def ocr_page(page, lang: str = 'eng', config: str = '', dpi: int = OCR_DPI,
+             max_image_mb: float = MAX_PAGE_IMAGE_MB) -> str:
+    """Tesseract text of one fitz page, from the OCR cache when its image was read before."""
+    pix = render_pixmap(page, dpi, max_image_mb)
+    cache = get_ocr_cache()
+    key = None
+    if cache is not None:
+        key = page_key(pix.samples_mv, pix.width, pix.height, pix.xres, lang, config, tesseract_version())
+        try:
+            text = cache.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"OCR cache lookup failed: {e}")
+            text = None
+        if text is not None:
+            return text
+    image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    del pix
+    try:
+        text = pytesseract.image_to_string(image, lang=lang, config=config)
+    finally:
+        image.close()
+    if key is not None:
+        try:
+            cache.put(key, text)
+        except sqlite3.Error as e:
+            logger.warning(f"OCR cache store failed: {e}")
+    return text
+
+
+def iter_ocr_pages(pdf_path: str, lang: str = 'eng', config: str = '', dpi: int = OCR_DPI,
+                   first_page: int = 1, last_page: Optional[int] = None,
+                   max_image_mb: float = MAX_PAGE_IMAGE_MB) -> Iterator[Tuple[int, str]]:
+    """Yield (1-based page number, OCR text) for pages first_page..last_page.
+
+    Only one page image exists at a time. A page that fails to OCR yields an
+    empty text rather than ending the iteration.
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        last_page = min(last_page or len(doc), len(doc))
+        for page_no in range(first_page, last_page + 1):
+            try:
+                text = ocr_page(doc[page_no - 1], lang, config, dpi, max_image_mb)
+            except Exception as e:
+                logger.warning(f"OCR failed for page {page_no} of {pdf_path}: {e}")
+                text = ''
+            yield page_no, text
+
+
+_worker_doc = None
+
+
+def _open_worker_doc(pdf_path: str) -> None:
+    """OcrQueue worker initializer: each worker opens the PDF once."""
+    global _worker_doc
+    import fitz  # PyMuPDF
+
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _ocr_queued_page(doc, page_no: int, text_layer: Optional[str], lang: str, config: str, dpi: int,
+                     max_image_mb: float) -> Tuple[str, Optional[Dict]]:
+    """(OCR text, language choice) of one queued page; the choice is None unless detected.
+
+    `text_layer` is None when the language is not to be detected.
+    """
+    page = doc[page_no - 1]
+    choice = None
+    try:
+        if text_layer is not None:
+            # page_script imports render_page from here
+            from page_script import detect_page_lang
+            choice = detect_page_lang(page, text_layer, lang)
+            lang = choice['lang']
+        return ocr_page(page, lang, config, dpi, max_image_mb), choice
+    except Exception as e:
+        logger.warning(f"OCR failed for page {page_no}: {e}")
+        return '', choice
+
+
+def _ocr_worker_page(page_no: int, text_layer: Optional[str], *args) -> Tuple[str, Optional[Dict]]:
+    return _ocr_queued_page(_worker_doc, page_no, text_layer, *args)
+
+
+class OcrQueue:
+    """Pages of one open fitz document, OCR'd in worker processes as soon as they are submitted.
+
+    With one worker, a single page to OCR, or a document not opened from a
+    file, pages are OCR'd in this process when their result is asked for.
+    With `detect_lang`, each page is read with the languages of its script
+    and `lang` is only the fallback. Leaving the context cancels what was not
+    started.
+    """
+
+    def __init__(self, doc, lang: str = 'eng', config: str = '', dpi: int = OCR_DPI,
+                 max_image_mb: float = MAX_PAGE_IMAGE_MB, workers: int = OCR_WORKERS,
+                 detect_lang: bool = False):
+        self.doc = doc
+        self.args = (lang, config, dpi, max_image_mb)
+        self.workers = workers
+        self.detect_lang = detect_lang
+        # Page number -> language choice of the pages read with detect_lang
+        self.choices: Dict[int, Dict] = {}
+        self._pool = None
+        self._futures: Dict[int, Optional[Future]] = {}
+        self._text_layers: Dict[int, Optional[str]] = {}
+
+    def submit(self, page_numbers: Iterable[int], text_layers: Optional[Dict[int, str]] = None) -> None:
+        """Queue 1-based pages for OCR; `text_layers` helps detect their script."""
+        page_numbers = [page_no for page_no in page_numbers if page_no not in self._futures]
+        if self._pool is None and self.workers > 1 and len(page_numbers) > 1 and self.doc.name:
+            self._pool = ProcessPoolExecutor(max_workers=min(self.workers, len(page_numbers)),
+                                             initializer=_open_worker_doc, initargs=(self.doc.name,))
+        for page_no in page_numbers:
+            text_layer = (text_layers or {}).get(page_no, '') if self.detect_lang else None
+            if self._pool is not None:
+                self._futures[page_no] = self._pool.submit(_ocr_worker_page, page_no, text_layer, *self.args)
+            else:
+                self._futures[page_no] = None
+                self._text_layers[page_no] = text_layer
+
+    def result(self, page_no: int) -> str:
+        """OCR text of a page, waiting for it if needed; '' when OCR failed."""
+        future = self._futures.get(page_no)
+        if future is None:
+            text_layer = self._text_layers.pop(page_no, '' if self.detect_lang else None)
+            text, choice = _ocr_queued_page(self.doc, page_no, text_layer, *self.args)
+        else:
+            try:
+                text, choice = future.result()
+            except Exception as e:
+                logger.warning(f"OCR failed for page {page_no}: {e}")
+                text, choice = '', None
+        if choice is not None:
+            self.choices[page_no] = choice
+        return text
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _ocr_frame(frame: 'Image.Image', frame_no: int, lang: str, config: str) -> str:
+    try:
+        return pytesseract.image_to_string(frame, lang=lang, config=config)
+    except Exception as e:
+        logger.warning(f"OCR failed for frame {frame_no}: {e}")
+        return ''
+    finally:
+        frame.close()
+
+
+def iter_ocr_frames(image_path: str, lang: str = 'eng', config: str = '',
+                    workers: int = OCR_WORKERS) -> Iterator[Tuple[int, str]]:
+    """Yield (1-based frame number, OCR text) for every frame of an image file, in order.
+
+    Frames are OCR'd by `workers` threads (Tesseract runs as a separate
+    process, so threads are enough); a frame is only decoded when a thread
+    is free for it, so at most `workers` frames exist at a time.
+    """
+    with Image.open(image_path) as image, ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        frame_count = getattr(image, 'n_frames', 1)
+        pending = deque()
+        for index in range(frame_count):
+            if len(pending) >= max(1, workers):
+                frame_no, future = pending.popleft()
+                yield frame_no, future.result()
+            image.seek(index)
+            # Straight to grayscale: one copy of the frame, a third of RGB's size
+            frame = image if image.mode == 'L' and frame_count == 1 else image.convert('L')
+            pending.append((index + 1, pool.submit(_ocr_frame, frame, index + 1, lang, config)))
+        while pending:
+            frame_no, future = pending.popleft()
+            yield frame_no, future.result()
+
+
+def main():
+    """Print the OCR text of a PDF page by page as it is read."""
+    if len(sys.argv) < 2:
+        print("Usage: python ocr_pages.py <file.pdf> [first_page] [last_page] | <image file>", file=sys.stderr)
+        sys.exit(1)
+    if not OCR_AVAILABLE:
+        print("OCR not available - install pytesseract and pillow", file=sys.stderr)
+        sys.exit(1)
+    if not sys.argv[1].lower().endswith('.pdf'):
+        for frame_no, text in iter_ocr_frames(sys.argv[1]):
+            print(f"--- frame {frame_no} ---")
+            print(text, flush=True)
+        return
+    first_page = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    last_page = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    for page_no, text in iter_ocr_pages(sys.argv[1], first_page=first_page, last_page=last_page):
+        print(f"--- page {page_no} ---")
+        print(text, flush=True)
+
+
+if __name__ == "__main__":
+    main()
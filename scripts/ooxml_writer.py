@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Streaming OOXML Writer
+======================
+
+Writes a DOCX package without building a python-docx object tree:
+
+- word/document.xml is streamed into the zip one paragraph at a time
+- Formatting comes from named styles in word/styles.xml (LegalTitle,
+  LegalHeading, LegalSubheading, LegalBody, ...) instead of per-run font
+  name, size and bold
+- Only the parts Word needs are written: content types, relationships,
+  styles and the document itself
+
+The target can be a path or any writable binary file object, including
+unseekable ones such as stdout.
+"""
+
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+FONT_NAME = 'Times New Roman'
+
+# Paragraph style key -> (style id, display name, size in points, bold)
+PARAGRAPH_STYLES = {
+    'title': ('LegalTitle', 'Legal Title', 16, True),
+    'heading': ('LegalHeading', 'Legal Heading', 14, True),
+    'subheading': ('LegalSubheading', 'Legal Subheading', 12, True),
+    'body': ('LegalBody', 'Legal Body', 11, False),
+    'small': ('LegalSmall', 'Legal Small', 10, False),
+    'footnote': ('LegalFootnote', 'Legal Footnote', 9, False),
+}
+# Character styles for runs whose weight differs from their paragraph style
+STRONG_STYLE = 'LegalStrong'
+PLAIN_STYLE = 'LegalPlain'
+
+# Margins in twentieths of a point: 1" top/bottom, 1.25" left/right (US Letter page)
+PAGE_SETUP = ('<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+              '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800" '
+              'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>')
+
+# Characters that are not allowed in XML 1.0
+INVALID_XML_RE = re.compile('[\x00-\x08\x0B\x0C\x0E-\x1F\uFFFE\uFFFF]')
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+
+def _styles_xml() -> str:
+    """Build word/styles.xml with the legal paragraph and character styles."""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+        f'<w:styles xmlns:w="{W_NS}">',
+        '<w:docDefaults><w:rPrDefault><w:rPr>',
+        f'<w:rFonts w:ascii="{FONT_NAME}" w:hAnsi="{FONT_NAME}" w:cs="{FONT_NAME}"/>',
+        '<w:sz w:val="22"/><w:szCs w:val="22"/>',
+        '</w:rPr></w:rPrDefault><w:pPrDefault/></w:docDefaults>',
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>',
+    ]
+    for style_id, name, size, bold in PARAGRAPH_STYLES.values():
+        parts.append(
+            f'<w:style w:type="paragraph" w:customStyle="1" w:styleId="{style_id}">'
+            f'<w:name w:val="{name}"/><w:basedOn w:val="Normal"/><w:qFormat/>'
+            f'<w:rPr>{"<w:b/><w:bCs/>" if bold else ""}'
+            f'<w:sz w:val="{size * 2}"/><w:szCs w:val="{size * 2}"/></w:rPr></w:style>'
+        )
+    parts.append(f'<w:style w:type="character" w:customStyle="1" w:styleId="{STRONG_STYLE}">'
+                 '<w:name w:val="Legal Strong"/><w:rPr><w:b/><w:bCs/></w:rPr></w:style>')
+    parts.append(f'<w:style w:type="character" w:customStyle="1" w:styleId="{PLAIN_STYLE}">'
+                 '<w:name w:val="Legal Plain"/><w:rPr><w:b w:val="0"/><w:bCs w:val="0"/></w:rPr></w:style>')
+    parts.append('</w:styles>')
+    return ''.join(parts)
+
+
+class StreamingDocxWriter:
+    """Write paragraphs straight into word/document.xml inside the DOCX zip.
+
+    Use as a context manager, or call close() to finish the package.
+    """
+
+    def __init__(self, target):
+        self._zip = zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED)
+        self._zip.writestr('[Content_Types].xml', CONTENT_TYPES)
+        self._zip.writestr('_rels/.rels', PACKAGE_RELS)
+        self._zip.writestr('word/_rels/document.xml.rels', DOCUMENT_RELS)
+        self._zip.writestr('word/styles.xml', _styles_xml())
+        self._document = self._zip.open('word/document.xml', 'w')
+        self._write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<w:document xmlns:w="{W_NS}"><w:body>')
+        self.paragraph_count = 0
+
+    def _write(self, xml: str):
+        self._document.write(xml.encode('utf-8'))
+
+    def add_paragraph(self, text: str, style: str = 'body', alignment: str = 'left', bold: bool = None):
+        """Append a paragraph.
+
+        `style` is a PARAGRAPH_STYLES key, `alignment` a w:jc value (left,
+        center, right, both). `bold` only needs passing when it differs from
+        the paragraph style.
+        """
+        text = INVALID_XML_RE.sub('', text.strip())
+        if not text:
+            return
+        style_id, _, _, style_bold = PARAGRAPH_STYLES[style]
+        run_style = ''
+        if bold is not None and bold != style_bold:
+            run_style = f'<w:rPr><w:rStyle w:val="{STRONG_STYLE if bold else PLAIN_STYLE}"/></w:rPr>'
+        # Line breaks inside the paragraph become <w:br/>, as python-docx writes them
+        lines = '<w:br/>'.join(f'<w:t xml:space="preserve">{escape(line)}</w:t>' for line in text.split('\n'))
+        self._write(f'<w:p><w:pPr><w:pStyle w:val="{style_id}"/><w:jc w:val="{alignment}"/></w:pPr>'
+                    f'<w:r>{run_style}{lines}</w:r></w:p>')
+        self.paragraph_count += 1
+
+    def add_page_break(self):
+        self._write('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+
+    def close(self):
+        """Write the section properties and finish the zip."""
+        if self._document is None:
+            return
+        self._write(f'{PAGE_SETUP}</w:body></w:document>')
+        self._document.close()
+        self._document = None
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+PDF Page Iterator
+=================
+
+One lazy source of page text for every extraction path:
+
+- iter_pages yields a PageRecord (page number, text, source) per page, in
+  document order or in any order given (last pages first, first K only, ...)
+- Backends: "fitz", "pdfplumber", "ocr" and "auto", which picks per page
+  from the quality score in page_quality.py
+- With OCR fallback, the fitz backend first preflights the pages
+  (page_preflight.py) and queues every scanned or mixed one for OCR in
+  parallel (ocr_pages.OcrQueue); native pages are yielded straight away
+- A page is only read when the consumer asks for it, so a consumer that has
+  what it needs simply stops iterating and the remaining pages are never
+  read or OCR'd
+
+Usage:
+    python page_iterator.py <file.pdf> [fitz|pdfplumber|ocr|auto]
+"""
+
+import sys
+import json
+import logging
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from ocr_pages import OCR_AVAILABLE, OCR_DPI, OcrQueue, ocr_page
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('fitz', 'pdfplumber', 'ocr', 'auto')
+
+
+class PageRecord(NamedTuple):
+    page_no: int  # 1-based
+    text: str
+    source: str   # 'fitz', 'pdfplumber', 'ocr' or 'empty'
+
+
+def _ocr_text(page, page_no: int, lang: str, config: str, dpi: int) -> str:
+    try:
+        return ocr_page(page, lang, config, dpi)
+    except Exception as e:
+        logger.warning(f"OCR failed for page {page_no}: {e}")
+        return ''
+
+
+def _iter_preflighted(doc, numbers: List[int], preflight: Optional[Dict[int, Dict]],
+                      lang: str, config: str, dpi: int, detect_lang: bool) -> Iterator[PageRecord]:
+    """fitz text of native pages, OCR of the others, which are all queued up front.
+
+    The language choice of each page read with `detect_lang` is added to its
+    preflight entry as 'ocr_lang'.
+    """
+    # page_preflight imports page_quality, which imports PageRecord from here
+    from page_preflight import OCR_KINDS, preflight_pages
+
+    checks = preflight if preflight is not None else preflight_pages(doc, numbers)
+    with OcrQueue(doc, lang, config, dpi, detect_lang=detect_lang) as queue:
+        queue.submit([page_no for page_no in numbers if checks[page_no]['kind'] in OCR_KINDS],
+                     {page_no: check['text'] for page_no, check in checks.items()})
+        for page_no in numbers:
+            check = checks[page_no]
+            text, source = check['text'], 'fitz'
+            if check['kind'] == 'blank':
+                source = 'empty'
+            elif check['kind'] in OCR_KINDS:
+                ocr_text = queue.result(page_no)
+                if page_no in queue.choices:
+                    check['ocr_lang'] = queue.choices[page_no]
+                # A mixed page keeps its text layer unless OCR reads more
+                if check['kind'] == 'scanned' or len(''.join(ocr_text.split())) > check['chars']:
+                    text, source = ocr_text, 'ocr'
+            yield PageRecord(page_no, text, source)
+
+
+def iter_pages(pdf, backend: str = 'fitz', page_numbers: Optional[Iterable[int]] = None,
+               ocr_fallback: bool = False, lang: str = 'eng', config: str = '',
+               dpi: int = OCR_DPI, preflight: Optional[Dict[int, Dict]] = None,
+               detect_lang: bool = False) -> Iterator[PageRecord]:
+    """Yield the text of `pdf` (a path or an open fitz document) page by page.
+
+    `page_numbers` (1-based) picks the pages and their order; all pages in
+    order by default. With the fitz backend, `ocr_fallback` OCRs the scanned
+    pages, and the mixed ones when OCR reads more text than their text layer;
+    `preflight` (page_preflight.preflight_pages of these pages) is computed
+    when not given; given, its text layers are reused. With `detect_lang`,
+    OCR'd pages are read with the languages of their script (page_script.py)
+    and `lang` is the fallback. A page that fails to OCR yields an empty text.
+    """
+    import fitz  # PyMuPDF
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown page backend: {backend}")
+    doc = fitz.open(pdf) if isinstance(pdf, str) else pdf
+    plumber = None
+    try:
+        numbers = range(1, len(doc) + 1) if page_numbers is None else page_numbers
+        if backend == 'auto':
+            # page_quality imports PageRecord from here
+            from page_quality import iter_scored_pages
+            for record, _ in iter_scored_pages(doc, numbers, lang):
+                yield record
+            return
+        if backend == 'fitz' and ocr_fallback and OCR_AVAILABLE:
+            yield from _iter_preflighted(doc, list(numbers), preflight, lang, config, dpi, detect_lang)
+            return
+        for page_no in numbers:
+            page = doc[page_no - 1]
+            if backend == 'fitz':
+                text = preflight[page_no]['text'] if preflight is not None else page.get_text()
+                source = 'fitz'
+            elif backend == 'pdfplumber':
+                if plumber is None:
+                    import pdfplumber
+                    plumber = pdfplumber.open(doc.name)
+                text = plumber.pages[page_no - 1].extract_text(x_tolerance=2, y_tolerance=2) or ''
+                source = 'pdfplumber'
+            else:
+                text, source = _ocr_text(page, page_no, lang, config, dpi), 'ocr'
+            yield PageRecord(page_no, text, source)
+    finally:
+        if plumber is not None:
+            plumber.close()
+        if isinstance(pdf, str):
+            doc.close()
+
+
+def main():
+    """Print the page records of a PDF as JSON lines, as they are read."""
+    if len(sys.argv) < 2:
+        print("Usage: python page_iterator.py <file.pdf> [fitz|pdfplumber|ocr|auto]", file=sys.stderr)
+        sys.exit(1)
+    backend = sys.argv[2] if len(sys.argv) > 2 else 'fitz'
+    for record in iter_pages(sys.argv[1], backend):
+        print(json.dumps(record._asdict(), ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
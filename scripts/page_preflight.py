@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Scanned-Page Preflight
+======================
+
+Sorts the pages of a PDF into native, scanned, mixed and blank from what
+fitz knows without rendering anything, so OCR can be queued for every page
+that needs it before the first page is consumed:
+
+- Text length is that of the text layer, which native pages then reuse; a
+  page with plenty of text is native and nothing else is looked at
+- On the other pages one pass over the drawing operations (fitz bbox log)
+  gives the share of the page covered by images
+- Only pages that would be mixed have their fonts counted: text drawn in
+  nothing but GlyphLessFont is an OCR layer a scanner already added, and the
+  page is native
+
+Kinds:
+    native   text layer with enough text, little text and few images, or an
+             OCR layer over a scan
+    scanned  (almost) no text, images on the page: OCR replaces the text
+    mixed    some text, mostly images (a stamp over a scan, or a body drawn
+             as word images): OCR'd, kept when it reads more text
+    blank    no text, (almost) no images: nothing to OCR
+
+Usage:
+    python page_preflight.py <file.pdf> [...]
+"""
+
+import sys
+import json
+from typing import Dict, Iterable, Optional
+
+from page_quality import (BLANK_IMAGE_COVERAGE, MIN_TEXT_CHARS, SCANNED_IMAGE_COVERAGE, SCANNED_MAX_TEXT_CHARS,
+                          image_coverage)
+
+KINDS = ('native', 'scanned', 'mixed', 'blank')
+# Kinds whose pages are OCR'd
+OCR_KINDS = ('scanned', 'mixed')
+# Font of the invisible text layer OCR tools (Tesseract, ocrmypdf, scanners) add
+OCR_LAYER_FONTS = frozenset({'GlyphLessFont'})
+
+
+def page_fonts(page) -> set:
+    """Names of the fonts text is drawn in, without subset prefixes (ABCDEF+)."""
+    return {span['font'].split('+', 1)[-1] for span in page.get_texttrace()}
+
+
+def preflight_page(page) -> Dict:
+    """Kind of one fitz page and what it was decided from; 'text' is its text layer.
+
+    'image_coverage' is None on pages with enough text to be native, 'fonts'
+    (how many are drawn) on pages that could not be mixed.
+    """
+    text = page.get_text()
+    chars = len(''.join(text.split()))
+    if chars >= SCANNED_MAX_TEXT_CHARS:
+        return {'kind': 'native', 'chars': chars, 'fonts': None, 'image_coverage': None, 'text': text}
+    coverage = image_coverage(page)
+    fonts = None
+    if chars < MIN_TEXT_CHARS:
+        kind = 'scanned' if coverage >= BLANK_IMAGE_COVERAGE else 'blank'
+    elif coverage >= SCANNED_IMAGE_COVERAGE:
+        names = page_fonts(page)
+        fonts = len(names)
+        # A scan that was OCR'd already: its text layer is what OCR would read
+        kind = 'native' if names and names <= OCR_LAYER_FONTS else 'mixed'
+    else:
+        kind = 'native'
+    return {'kind': kind, 'chars': chars, 'fonts': fonts, 'image_coverage': round(coverage, 3), 'text': text}
+
+
+def preflight_pages(doc, page_numbers: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+    """preflight_page of each 1-based page number (all pages by default), in that order."""
+    numbers = range(1, len(doc) + 1) if page_numbers is None else page_numbers
+    return {page_no: preflight_page(doc[page_no - 1]) for page_no in numbers}
+
+
+def summarize(checks: Dict[int, Dict]) -> Dict:
+    """Page count per kind and the page numbers of the non-native ones, for reports."""
+    summary = {kind: 0 for kind in KINDS}
+    pages = {kind: [] for kind in KINDS if kind != 'native'}
+    for page_no, check in checks.items():
+        summary[check['kind']] += 1
+        if check['kind'] in pages:
+            pages[check['kind']].append(page_no)
+    summary.update({f'{kind}_pages': sorted(numbers) for kind, numbers in pages.items()})
+    return summary
+
+
+def main():
+    """Print the preflight of the given PDFs as JSON."""
+    import fitz  # PyMuPDF
+
+    if len(sys.argv) < 2:
+        print("Usage: python page_preflight.py <file.pdf> [...]", file=sys.stderr)
+        sys.exit(1)
+    results = {}
+    for path in sys.argv[1:]:
+        with fitz.open(path) as doc:
+            checks = preflight_pages(doc)
+        for check in checks.values():
+            del check['text']
+        results[path] = {'summary': summarize(checks), 'pages': checks}
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Per-Page Text Quality
+=====================
+
+Scores the text layer of every PDF page and picks the cheapest backend that
+gives adequate text for that page, instead of falling back for the whole
+document:
+
+- Metrics come from the fitz page at no extra rendering cost: character
+  entropy, dictionary hit rate (lexicon.py), glyph anomalies (U+FFFD, private
+  use area, control characters, pdfminer "(cid:N)" codes) and, for pages
+  with little text, the share of the page covered by images
+- Backends are tried per page from cheapest to dearest: fitz, pdfplumber, OCR
+  of that page alone. Blank pages are not OCR'd
+- The result carries a provenance map: source, score and reasons per page
+
+Usage:
+    python page_quality.py <file.pdf> [...]
+"""
+
+import sys
+import re
+import json
+import math
+import logging
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+from ocr_pages import OCR_AVAILABLE, ocr_page
+from page_iterator import PageRecord
+
+# Fewer non-space characters than this is no text layer at all
+MIN_TEXT_CHARS = 20
+# Entropy is only judged on pages with this much text; short texts are skewed
+MIN_ENTROPY_CHARS = 200
+# Bits per character of running text in Latin or Devanagari script
+MIN_ENTROPY = 3.0
+MAX_ENTROPY = 6.5
+MAX_ANOMALY_RATIO = 0.02
+# Words needed before the dictionary hit rate means anything
+MIN_DICTIONARY_WORDS = 10
+MIN_DICTIONARY_HIT_RATE = 0.5
+# A page with little text and this much of it under images is a scan, or has
+# its body drawn as images (one per word in some High Court PDFs) with only
+# the upload stamps as text
+SCANNED_IMAGE_COVERAGE = 0.2
+SCANNED_MAX_TEXT_CHARS = 500
+# Below this image coverage a page without text is blank rather than scanned
+BLANK_IMAGE_COVERAGE = 0.05
+
+ANOMALY_RE = re.compile(r'[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]|\(cid:\d+\)')
+WORD_RE = re.compile(r'[A-Za-z]{3,}')
+
+_lexicon = False
+
+
+def _get_lexicon():
+    """The shared lexicon, or None when it cannot be loaded or built here."""
+    global _lexicon
+    if _lexicon is False:
+        try:
+            from lexicon import get_lexicon
+            _lexicon = get_lexicon()
+        except (ImportError, OSError, LookupError, ValueError) as e:
+            logger.warning(f"Lexicon not available, dictionary hit rate skipped: {e}")
+            _lexicon = None
+    return _lexicon
+
+
+# bbox log entries that draw images
+IMAGE_OPS = ('fill-image', 'fill-imgmask')
+
+
+def image_coverage(page) -> float:
+    """Share of the page area under images (overlaps counted twice, capped at 1).
+
+    Read from the page's bbox log, one pass over its drawing operations:
+    cheaper than get_image_info, which also decodes image metadata.
+    """
+    x0, y0, x1, y1 = page.rect
+    page_area = (x1 - x0) * (y1 - y0)
+    if page_area <= 0:
+        return 0.0
+    covered = 0.0
+    for op, (bx0, by0, bx1, by1) in page.get_bboxlog():
+        if op not in IMAGE_OPS:
+            continue
+        width = min(x1, bx1) - max(x0, bx0)
+        height = min(y1, by1) - max(y0, by0)
+        if width > 0 and height > 0:
+            covered += width * height
+    return min(1.0, covered / page_area)
+
+
+def score_text(text: str, coverage: Optional[float] = None) -> Dict:
+    """Quality metrics of one page's text; `adequate` is False if any reason applies.
+
+    `coverage` is the page's image coverage, None when it was not measured.
+    """
+    chars = Counter(text)
+    for space in ' \t\r\n\f\v':
+        chars.pop(space, None)
+    total = sum(chars.values())
+    entropy = -sum(n / total * math.log2(n / total) for n in chars.values()) if total else 0.0
+    anomalies = len(ANOMALY_RE.findall(text))
+    anomaly_ratio = anomalies / total if total else 0.0
+
+    hit_rate = None
+    lexicon = _get_lexicon()
+    if lexicon is not None:
+        words = Counter(word.lower() for word in WORD_RE.findall(text))
+        word_count = sum(words.values())
+        if word_count >= MIN_DICTIONARY_WORDS:
+            hit_rate = sum(n for word, n in words.items() if word in lexicon) / word_count
+
+    reasons = []
+    if total < MIN_TEXT_CHARS:
+        reasons.append('no_text')
+    if anomaly_ratio > MAX_ANOMALY_RATIO:
+        reasons.append('glyph_anomalies')
+    if total >= MIN_ENTROPY_CHARS and not MIN_ENTROPY <= entropy <= MAX_ENTROPY:
+        reasons.append('entropy')
+    if hit_rate is not None and hit_rate < MIN_DICTIONARY_HIT_RATE:
+        reasons.append('dictionary')
+    if coverage is not None and coverage >= SCANNED_IMAGE_COVERAGE and total < SCANNED_MAX_TEXT_CHARS:
+        reasons.append('scanned')
+
+    # 0-1 summary for comparing backends on the same page
+    score = min(1.0, total / MIN_ENTROPY_CHARS) * max(0.0, 1 - anomaly_ratio / MAX_ANOMALY_RATIO / 2)
+    if hit_rate is not None:
+        score *= min(1.0, hit_rate / MIN_DICTIONARY_HIT_RATE)
+    return {
+        'chars': total,
+        'entropy': round(entropy, 2),
+        'anomaly_ratio': round(anomaly_ratio, 4),
+        'dictionary_hit_rate': None if hit_rate is None else round(hit_rate, 3),
+        'image_coverage': None if coverage is None else round(coverage, 3),
+        'score': round(score, 3),
+        'adequate': not reasons,
+        'reasons': reasons,
+    }
+
+
+def iter_scored_pages(pdf, page_numbers: Optional[Iterable[int]] = None,
+                      ocr_lang: str = 'eng') -> Iterator[Tuple[PageRecord, Dict]]:
+    """Yield (PageRecord, provenance) per page, text from its cheapest adequate backend.
+
+    `pdf` is a path or an open fitz document; `page_numbers` (1-based) picks
+    the pages and their order. Provenance holds the source ('fitz',
+    'pdfplumber', 'ocr' or 'empty'), the backends tried and the metrics; when
+    no backend is adequate the best-scoring text is kept and 'fallback' is True.
+    """
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(pdf) if isinstance(pdf, str) else pdf
+    plumber = None
+    try:
+        for page_no in range(1, len(doc) + 1) if page_numbers is None else page_numbers:
+            page = doc[page_no - 1]
+            text = page.get_text()
+            quality = score_text(text)
+            # Images only matter on pages with little text; measuring
+            # them costs a second pass over the page
+            coverage = None
+            if quality['chars'] < SCANNED_MAX_TEXT_CHARS:
+                coverage = image_coverage(page)
+                quality = score_text(text, coverage)
+            candidates = [('fitz', text, quality)]
+
+            blank = quality['reasons'] == ['no_text'] and coverage < BLANK_IMAGE_COVERAGE
+            # pdfplumber reads the same text layer with another decoder:
+            # worth it for garbled text, not for a missing one
+            if not quality['adequate'] and not blank and quality['chars'] >= MIN_TEXT_CHARS \
+                    and PDFPLUMBER_AVAILABLE:
+                if plumber is None:
+                    plumber = pdfplumber.open(doc.name)
+                text = plumber.pages[page_no - 1].extract_text(x_tolerance=2, y_tolerance=2) or ''
+                candidates.append(('pdfplumber', text, score_text(text, coverage)))
+            if not candidates[-1][2]['adequate'] and not blank and OCR_AVAILABLE:
+                try:
+                    text = ocr_page(page, ocr_lang)
+                    # The rendered image is what was read: coverage no longer applies
+                    candidates.append(('ocr', text, score_text(text)))
+                except Exception as e:
+                    logger.warning(f"OCR failed for page {page_no}: {e}")
+
+            adequate = [candidate for candidate in candidates if candidate[2]['adequate']]
+            source, text, quality = adequate[0] if adequate else max(candidates, key=lambda c: c[2]['score'])
+            if blank:
+                source = 'empty'
+            yield PageRecord(page_no, text, source), {
+                'page': page_no, 'source': source, 'fallback': not adequate and not blank,
+                'tried': [candidate[0] for candidate in candidates], **quality}
+    finally:
+        if plumber is not None:
+            plumber.close()
+        if isinstance(pdf, str):
+            doc.close()
+
+
+def extract_pages(pdf_path: str, ocr_lang: str = 'eng') -> Dict:
+    """{'pages': [text, ...], 'provenance': [...]} for every page (see iter_scored_pages)."""
+    pages, provenance = [], []
+    for record, page_provenance in iter_scored_pages(pdf_path, ocr_lang=ocr_lang):
+        pages.append(record.text)
+        provenance.append(page_provenance)
+    return {'pages': pages, 'provenance': provenance}
+
+
+def main():
+    """Print the provenance map of the given PDFs as JSON."""
+    if len(sys.argv) < 2:
+        print("Usage: python page_quality.py <file.pdf> [...]", file=sys.stderr)
+        sys.exit(1)
+    results = {path: extract_pages(path)['provenance'] for path in sys.argv[1:]}
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Compact Page Records
+====================
+
+The text of a PDF page as parallel arrays instead of one Python tuple, list
+or dict per block and span:
+
+- PageBlocks: block coordinates in one (n, 4) float32 array plus the block
+  texts and the font, size and weight carrying most of each block's
+  characters (used by the DOCX converter and the running header detector)
+- PageSpans: span geometry, size, flags and block/line numbers in NumPy
+  arrays; span texts and font names are ids into a per-document StringTable,
+  so repeated strings (fonts, spaces, punctuation) are stored once (used by the
+  judgement HTML extractors)
+
+Both pickle cheaply, which matters when layouts cross worker processes.
+"""
+
+import re
+from typing import Dict, List
+
+import numpy as np
+
+# fitz block type of text blocks; type 1 is an image whose "text" is a placeholder
+TEXT_BLOCK = 0
+# fitz span flag for bold text; many PDFs only say so in the font name
+BOLD_FLAG = 16
+BOLD_FONT_RE = re.compile(r'bold|black|heavy', re.IGNORECASE)
+
+
+def is_bold(font: str, flags: int) -> bool:
+    """Whether a span is bold, from its flags or its font name."""
+    return bool(flags & BOLD_FLAG) or BOLD_FONT_RE.search(font) is not None
+
+
+class StringTable:
+    """Interns strings to small integer ids; one table per document."""
+
+    __slots__ = ('ids', 'strings')
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, text: str) -> int:
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.strings[string_id]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class PageBlocks:
+    """Text blocks of one page: x0, y0, x1, y1 per row of `coords`, plus texts.
+
+    `fonts` (ids into `strings`), `sizes` and `bold` describe each block's
+    dominant span style: the one covering most of its characters. Sizes are
+    rounded to half points.
+    """
+
+    __slots__ = ('width', 'height', 'coords', 'texts', 'strings', 'fonts', 'sizes', 'bold')
+
+    def __init__(self, width: float, height: float, coords: np.ndarray, texts: List[str],
+                 strings: StringTable, fonts: np.ndarray, sizes: np.ndarray, bold: np.ndarray):
+        self.width = width
+        self.height = height
+        self.coords = coords
+        self.texts = texts
+        self.strings = strings
+        self.fonts = fonts
+        self.sizes = sizes
+        self.bold = bold
+
+    @classmethod
+    def from_page(cls, page, strings: StringTable = None) -> 'PageBlocks':
+        """Read a fitz page's text blocks and their styles in one get_text("dict") pass."""
+        import fitz  # PyMuPDF
+
+        strings = strings if strings is not None else StringTable()
+        coords, texts, styles = [], [], []
+        for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]:
+            if block["type"] != TEXT_BLOCK:
+                continue
+            lines = []
+            # (font, size, bold) -> characters set in that style
+            weights = {}
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    style = (span["font"], round(span["size"] * 2) / 2, is_bold(span["font"], span["flags"]))
+                    weights[style] = weights.get(style, 0) + len(span["text"].strip())
+                lines.append(''.join(span["text"] for span in line["spans"]))
+            font, size, bold = max(weights, key=weights.get) if weights else ('', 0.0, False)
+            coords.append(block["bbox"])
+            # Same text as get_text("blocks"): lines joined, trailing newline
+            texts.append('\n'.join(lines) + '\n')
+            styles.append((strings.intern(font), size, bold))
+        fonts, sizes, bold = zip(*styles) if styles else ((), (), ())
+        return cls(page.rect.width, page.rect.height, np.array(coords, dtype=np.float32).reshape(-1, 4),
+                   texts, strings, np.array(fonts, dtype=np.int32), np.array(sizes, dtype=np.float32),
+                   np.array(bold, dtype=bool))
+
+    def take(self, indices, texts: List[str] = None) -> 'PageBlocks':
+        """Blocks at `indices`, in that order; `texts` replaces their texts."""
+        indices = np.asarray(indices, dtype=np.intp)
+        if texts is None:
+            texts = [self.texts[i] for i in indices]
+        return PageBlocks(self.width, self.height, self.coords[indices].reshape(-1, 4), texts, self.strings,
+                          self.fonts[indices], self.sizes[indices], self.bold[indices])
+
+    def styles(self) -> List[tuple]:
+        """(font name, size, bold) of each block."""
+        names = self.strings.strings
+        return [(names[font], size, bold)
+                for font, size, bold in zip(self.fonts.tolist(), self.sizes.tolist(), self.bold.tolist())]
+
+    def __len__(self):
+        return len(self.texts)
+
+
+class PageSpans:
+    """Text spans of one page as parallel arrays.
+
+    `block` and `line` number each span's block and line within the page (in
+    reading order as fitz returns them); `text` and `font` index `strings`.
+    """
+
+    __slots__ = ('width', 'height', 'strings', 'coords', 'origin_x', 'size', 'flags',
+                 'block', 'line', 'text', 'font')
+
+    def __init__(self, width: float, height: float, strings: StringTable, rows: List[tuple]):
+        self.width = width
+        self.height = height
+        self.strings = strings
+        columns = list(zip(*rows)) if rows else [()] * 11
+        self.coords = np.array(columns[:4], dtype=np.float32).T.reshape(-1, 4)
+        self.origin_x = np.array(columns[4], dtype=np.float32)
+        self.size = np.array(columns[5], dtype=np.float32)
+        self.flags = np.array(columns[6], dtype=np.int32)
+        self.block = np.array(columns[7], dtype=np.int32)
+        self.line = np.array(columns[8], dtype=np.int32)
+        self.text = np.array(columns[9], dtype=np.int32)
+        self.font = np.array([strings.intern(f) for f in columns[10]] if rows else (), dtype=np.int32)
+
+    @classmethod
+    def from_page(cls, page, strings: StringTable) -> 'PageSpans':
+        """Read a fitz page's spans, interning texts and font names into `strings`."""
+        import fitz  # PyMuPDF
+
+        rows = []
+        line_number = 0
+        # Without TEXT_PRESERVE_IMAGES fitz does not decode the page's images
+        for block_number, block in enumerate(page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]):
+            for line in block.get("lines", ()):
+                for span in line["spans"]:
+                    x0, y0, x1, y1 = span["bbox"]
+                    rows.append((x0, y0, x1, y1, span["origin"][0], span["size"], span["flags"],
+                                 block_number, line_number, strings.intern(span["text"]), span["font"]))
+                line_number += 1
+        return cls(page.rect.width, page.rect.height, strings, rows)
+
+    def texts(self) -> List[str]:
+        """Span texts in order."""
+        strings = self.strings.strings
+        return [strings[i] for i in self.text.tolist()]
+
+    def page_text(self) -> str:
+        """Span texts joined, one line per fitz line."""
+        strings = self.strings.strings
+        lines: Dict[int, List[str]] = {}
+        for line, text in zip(self.line.tolist(), self.text.tolist()):
+            lines.setdefault(line, []).append(strings[text])
+        return '\n'.join(''.join(parts) for parts in lines.values())
+
+    def __len__(self):
+        return len(self.text)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Per-Page Script Detection
+=========================
+
+Picks the Tesseract languages for each page to OCR instead of one setting
+for the whole document: English models read Hindi pages as garbage, and
+"hin+eng" on every page is two to three times slower than "eng".
+
+- Letters already in the page's text layer (a stamp, a Devanagari header)
+  add their script when there are enough of them; a text layer with enough
+  letters to speak for the whole page settles it without rendering anything
+- Otherwise Tesseract OSD on a 72 DPI thumbnail of the page names its
+  dominant script
+- Each script maps to one language pack; only installed packs are used, and
+  the route's language is kept when nothing is detected
+
+Usage:
+    python page_script.py <file.pdf> [first_page] [last_page]
+"""
+
+import sys
+import re
+import json
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from ocr_pages import OCR_AVAILABLE, render_page
+
+try:
+    import pytesseract
+except ImportError:
+    # OCR_AVAILABLE is False
+    pytesseract = None
+
+logger = logging.getLogger(__name__)
+
+# Tesseract language pack of each script it can name
+SCRIPT_LANGS = {'Latin': 'eng', 'Devanagari': 'hin'}
+SCRIPT_RES = {
+    'Latin': re.compile(r'[A-Za-z]'),
+    'Devanagari': re.compile(r'[\u0900-\u097f]'),
+}
+# Letters of a script the text layer needs for that script to count
+MIN_SCRIPT_LETTERS = 20
+# Letters in the text layer above which it tells the page's scripts and OSD
+# is skipped; a stamp or a header over a scan stays below it
+TEXT_LAYER_DECISIVE_LETTERS = 200
+# OSD reads script shapes, not words: a thumbnail is enough
+OSD_DPI = 72
+# OSD script confidence below which its answer is ignored
+OSD_MIN_CONFIDENCE = 1.0
+
+
+@lru_cache(maxsize=1)
+def installed_langs() -> Optional[frozenset]:
+    """Language packs Tesseract has, or None when it cannot tell."""
+    try:
+        return frozenset(pytesseract.get_languages(config=''))
+    except Exception as e:
+        logger.warning(f"Could not list Tesseract languages: {e}")
+        return None
+
+
+def script_letters(text: str) -> Dict[str, int]:
+    """Letters of each script in `text`."""
+    return {script: len(pattern.findall(text)) for script, pattern in SCRIPT_RES.items()}
+
+
+def text_scripts(text: str, counts: Optional[Dict[str, int]] = None) -> List[str]:
+    """Scripts with at least MIN_SCRIPT_LETTERS letters in `text`, most letters first."""
+    counts = counts if counts is not None else script_letters(text)
+    return [script for script, count in sorted(counts.items(), key=lambda item: -item[1])
+            if count >= MIN_SCRIPT_LETTERS]
+
+
+def osd_script(page, dpi: int = OSD_DPI) -> Optional[Dict]:
+    """{'script', 'confidence'} from Tesseract OSD, None when it cannot tell."""
+    image = render_page(page, dpi)
+    try:
+        osd = pytesseract.image_to_osd(image, config='--psm 0', output_type=pytesseract.Output.DICT)
+    except Exception as e:
+        # Raised for pages with too little text, or without osd.traineddata
+        logger.debug(f"OSD failed: {e}")
+        return None
+    finally:
+        image.close()
+    if osd.get('script_conf', 0) < OSD_MIN_CONFIDENCE:
+        return None
+    return {'script': osd['script'], 'confidence': round(float(osd['script_conf']), 2)}
+
+
+def detect_page_lang(page, text: str = '', default: str = 'eng') -> Dict:
+    """Tesseract `lang` for one page, with the scripts and method it came from.
+
+    `text` is the page's text layer, if any; `default` is used when no
+    installed language pack matches what was detected.
+    """
+    counts = script_letters(text)
+    # Enough text layer to go by: no render, no OSD
+    osd = osd_script(page) if sum(counts.values()) < TEXT_LAYER_DECISIVE_LETTERS else None
+    scripts = [osd['script']] if osd else []
+    from_text = [script for script in text_scripts(text, counts) if script not in scripts]
+    scripts += from_text
+    langs = [SCRIPT_LANGS[script] for script in scripts if script in SCRIPT_LANGS]
+    available = installed_langs()
+    if available is not None:
+        langs = [lang for lang in langs if lang in available]
+    method = '+'.join(name for name, used in (('osd', osd), ('text_layer', from_text)) if used)
+    return {
+        'lang': '+'.join(langs) if langs else default,
+        'scripts': scripts,
+        'method': method if langs else 'default',
+        'osd_confidence': osd['confidence'] if osd else None,
+    }
+
+
+def main():
+    """Print the language picked for each page of a PDF as JSON lines."""
+    import fitz  # PyMuPDF
+
+    if len(sys.argv) < 2:
+        print("Usage: python page_script.py <file.pdf> [first_page] [last_page]", file=sys.stderr)
+        sys.exit(1)
+    if not OCR_AVAILABLE:
+        print("OCR not available - install pytesseract and pillow", file=sys.stderr)
+        sys.exit(1)
+    with fitz.open(sys.argv[1]) as doc:
+        first_page = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        last_page = min(int(sys.argv[3]) if len(sys.argv) > 3 else len(doc), len(doc))
+        for page_no in range(first_page, last_page + 1):
+            page = doc[page_no - 1]
+            choice = detect_page_lang(page, page.get_text())
+            print(json.dumps({'page': page_no, **choice}, ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
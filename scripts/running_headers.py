@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Running Header/Footer Detection
+===============================
+
+Finds the headers and footers a document repeats on most of its pages, so
+they can be dropped from the DOCX conversion and kept out of LLM prompts:
+
+- Only the top and bottom bands of each page are considered (a share of the
+  page height for block layouts, a few lines for plain page text)
+- Text is normalized before it is compared: lower-cased, whitespace collapsed
+  and every digit run replaced by '#', so "(3 of 12)", "Page 4" and
+  "[CW-1234/2020]" match their counterparts on the other pages
+- A (band, normalized text) key seen on enough pages is a running element;
+  the keys form a frozenset, so checking a block is a single hash lookup
+- For block layouts, band keys that read as page numbers ("page #", "# of #",
+  a lone "#") join the set even when they repeat on too few pages; each
+  distinct key is matched once per document, not once per page
+
+Usage:
+    python running_headers.py <file.pdf|file.txt> [...]
+"""
+
+import sys
+import re
+import json
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+# Blocks starting in the top 12% or ending in the bottom 12% of a page
+BAND_RATIO = 0.12
+# Non-empty lines taken from the top and bottom of plain page text
+BAND_LINES = 3
+# Share of the pages a key must appear on to count as running
+MIN_PAGE_SHARE = 0.6
+
+DIGITS_RE = re.compile(r'\d+')
+WHITESPACE_RE = re.compile(r'\s+')
+# Page numbers, searched for in normalized text: "Page No. 3", "(3 of 12)", a
+# lone "3", and bracketed case-number footers some courts print on every page
+# ("[CW-1234/2020]", "[CRLMP-56/2021]", "[S.B. Crl. Rev. No. 7/2019]")
+PAGE_NUMBER_RE = re.compile(r'page ?(?:no\.? ?)?#|# ?of ?#|\[[a-z][a-z. ]*[-. ]?#/#\]|^#$')
+
+TOP = 'top'
+BOTTOM = 'bottom'
+
+
+def normalize(text: str) -> str:
+    """Comparison key for a header/footer: "Page 3 of 12" -> "page # of #"."""
+    return WHITESPACE_RE.sub(' ', DIGITS_RE.sub('#', text.lower())).strip()
+
+
+def page_bands(page) -> List[Optional[str]]:
+    """TOP, BOTTOM or None for each block of a PageBlocks page."""
+    top = (page.coords[:, 1] < BAND_RATIO * page.height).tolist()
+    bottom = (page.coords[:, 3] > (1 - BAND_RATIO) * page.height).tolist()
+    return [TOP if t else BOTTOM if b else None for t, b in zip(top, bottom)]
+
+
+def _running_keys(page_keys: Iterable[set], page_count: int) -> frozenset:
+    """Keys present on at least MIN_PAGE_SHARE of the pages (and on two or more)."""
+    counts = Counter(key for keys in page_keys for key in keys)
+    threshold = max(2, int(MIN_PAGE_SHARE * page_count))
+    return frozenset(key for key, count in counts.items() if count >= threshold and key[1])
+
+
+def is_page_number(key: str) -> bool:
+    """Whether a normalized band text reads as a page number."""
+    return PAGE_NUMBER_RE.search(key) is not None
+
+
+def detect_running_blocks(layout: List) -> frozenset:
+    """Running (band, key) pairs of a layout of PageBlocks pages, page numbers included."""
+    page_keys = []
+    for page in layout:
+        page_keys.append({(band, normalize(text)) for band, text in zip(page_bands(page), page.texts) if band})
+    page_numbers = {key for key in set().union(*page_keys) if is_page_number(key[1])}
+    return _running_keys(page_keys, len(layout)) | page_numbers
+
+
+def running_blocks(page, running: frozenset, bands: List[Optional[str]] = None) -> List[bool]:
+    """For each block of a PageBlocks page, whether it is a running header/footer."""
+    if bands is None:
+        bands = page_bands(page)
+    return [band is not None and (band, normalize(text)) in running for band, text in zip(bands, page.texts)]
+
+
+def _band_lines(lines: List[str]) -> List[Tuple[str, str]]:
+    """(band, key) of the first and last BAND_LINES non-empty lines of a page."""
+    keys = [(TOP, normalize(line)) for line in lines[:BAND_LINES]]
+    keys += [(BOTTOM, normalize(line)) for line in lines[-BAND_LINES:]]
+    return keys
+
+
+def detect_running_lines(pages: List[str]) -> frozenset:
+    """Running (band, key) pairs of plain per-page text."""
+    page_keys = []
+    for page in pages:
+        lines = [line for line in page.splitlines() if line.strip()]
+        page_keys.append(set(_band_lines(lines)))
+    return _running_keys(page_keys, len(pages))
+
+
+def strip_running_lines(pages: List[str], running: frozenset = None) -> List[str]:
+    """Remove running header/footer lines from every page but the first.
+
+    The first page keeps them: its heading often carries the court, case number
+    or neutral citation that the running header repeats.
+    """
+    if running is None:
+        running = detect_running_lines(pages)
+    if not running:
+        return list(pages)
+    stripped = pages[:1]
+    for page in pages[1:]:
+        lines = page.splitlines()
+        non_empty = [i for i, line in enumerate(lines) if line.strip()]
+        drop = {i for i in non_empty[:BAND_LINES] if (TOP, normalize(lines[i])) in running}
+        drop |= {i for i in non_empty[-BAND_LINES:] if (BOTTOM, normalize(lines[i])) in running}
+        stripped.append('\n'.join(line for i, line in enumerate(lines) if i not in drop))
+    return stripped
+
+
+def main():
+    """Print the running headers/footers of the given files as JSON."""
+    if len(sys.argv) < 2:
+        print("Usage: python running_headers.py <file.pdf|file.txt> [...]", file=sys.stderr)
+        sys.exit(1)
+
+    results = {}
+    for path in sys.argv[1:]:
+        if path.lower().endswith('.pdf'):
+            import fitz  # PyMuPDF
+            from page_records import PageBlocks
+            with fitz.open(path) as doc:
+                layout = [PageBlocks.from_page(page) for page in doc]
+                pages = [page.get_text() for page in doc]
+            results[path] = {
+                'blocks': sorted(' | '.join(key) for key in detect_running_blocks(layout)),
+                'lines': sorted(' | '.join(key) for key in detect_running_lines(pages)),
+            }
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages = f.read().split('\f')
+            results[path] = {'lines': sorted(' | '.join(key) for key in detect_running_lines(pages))}
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
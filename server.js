@@ -4,6 +4,9 @@ const multer = require("multer");
 const cors = require("cors");
 const { spawn } = require('child_process');
 const path = require("path");
+const crypto = require('crypto');
+const zlib = require('zlib');
+const { pipeline } = require('stream/promises');
 const rateLimit = require('express-rate-limit');
 require("dotenv").config();
 
@@ -75,6 +78,219 @@ const upload = multer({
     }
 });
 
+// Uploaded PDFs are kept here under their SHA-256, so the judgement/order
+// HTML can be rendered when a client asks for it rather than inside every
+// /extract-metadata response.  Rendered HTML is cached next to the PDF,
+// plain and gzipped.
+const DOCUMENTS_DIR = path.resolve(process.env.DOCUMENTS_DIR || path.join(__dirname, 'documents'));
+const DOCUMENT_HASH_RE = /^[0-9a-f]{64}$/;
+const JUDGEMENT_ORDER_TIMEOUT_MS = 300000;
+// Renders in progress by document hash; concurrent requests share one
+const judgementOrderRenders = new Map();
+// DOCUMENTS_DIR is bounded: documents unused for DOCUMENTS_MAX_AGE_DAYS are
+// dropped, then the least recently used ones while the directory holds more
+// than DOCUMENTS_MAX_MB.  A document's last use is its PDF's mtime.
+const DOCUMENTS_MAX_MB = Number(process.env.DOCUMENTS_MAX_MB || 1024);
+const DOCUMENTS_MAX_AGE_DAYS = Number(process.env.DOCUMENTS_MAX_AGE_DAYS || 7);
+// Pruning goes down to this share of the bound, so it does not run on every upload
+const DOCUMENTS_PRUNE_TO_RATIO = 0.9;
+let documentsPrune = null;
+
+function documentPath(hash, suffix) {
+    return path.join(DOCUMENTS_DIR, hash + suffix);
+}
+
+function judgementOrderUrl(hash) {
+    return `/documents/${hash}/judgement-order`;
+}
+
+/**
+ * SHA-256 of a file, hex encoded
+ * @param {string} filePath - Path to the file
+ * @returns {Promise<string>}
+ */
+async function hashFile(filePath) {
+    const hash = crypto.createHash('sha256');
+    await pipeline(fs.createReadStream(filePath), hash);
+    return hash.digest('hex');
+}
+
+/**
+ * Keep a copy of an uploaded PDF in DOCUMENTS_DIR under its hash
+ * @param {string} filePath - Path to the uploaded file
+ * @returns {Promise<string>} - The document hash
+ */
+async function storeDocument(filePath) {
+    const hash = await hashFile(filePath);
+    const storedPath = documentPath(hash, '.pdf');
+    if (fs.existsSync(storedPath)) {
+        await touchDocument(hash);
+    } else {
+        await fs.promises.mkdir(DOCUMENTS_DIR, { recursive: true });
+        // Copy then rename, so a stored PDF is never seen half written
+        const tmpPath = `${storedPath}.${process.pid}.${Date.now()}.tmp`;
+        await fs.promises.copyFile(filePath, tmpPath);
+        await fs.promises.rename(tmpPath, storedPath);
+        await touchDocument(hash);
+        pruneDocuments(hash);
+    }
+    return hash;
+}
+
+/**
+ * Mark a stored document as just used
+ * @param {string} hash - Document hash
+ */
+async function touchDocument(hash) {
+    const now = new Date();
+    try {
+        await fs.promises.utimes(documentPath(hash, '.pdf'), now, now);
+    } catch (error) {
+        // Pruned meanwhile: the next upload stores it again
+    }
+}
+
+/**
+ * Remove the documents, and their cached HTML, over the age and size bounds
+ * @param {string} keepHash - Hash of the document just stored, never removed
+ * @returns {Promise<number>} - How many documents were removed
+ */
+async function runDocumentsPrune(keepHash) {
+    const documents = new Map();
+    for (const name of await fs.promises.readdir(DOCUMENTS_DIR)) {
+        const hash = name.slice(0, 64);
+        if (!DOCUMENT_HASH_RE.test(hash)) {
+            continue;
+        }
+        let stat;
+        try {
+            stat = await fs.promises.stat(path.join(DOCUMENTS_DIR, name));
+        } catch (error) {
+            continue;
+        }
+        const document = documents.get(hash) || { hash, names: [], size: 0, pdfMs: null, newestMs: 0 };
+        document.names.push(name);
+        document.size += stat.size;
+        document.newestMs = Math.max(document.newestMs, stat.mtimeMs);
+        if (name === hash + '.pdf') {
+            document.pdfMs = stat.mtimeMs;
+        }
+        documents.set(hash, document);
+    }
+    // Files left without their PDF (a failed copy) count from their own mtime
+    for (const document of documents.values()) {
+        document.usedMs = document.pdfMs === null ? document.newestMs : document.pdfMs;
+    }
+    const oldestKeptMs = Date.now() - DOCUMENTS_MAX_AGE_DAYS * 24 * 60 * 60 * 1000;
+    let totalSize = 0;
+    for (const document of documents.values()) {
+        totalSize += document.size;
+    }
+    const maxSize = DOCUMENTS_MAX_MB * 1024 * 1024;
+    const targetSize = totalSize > maxSize ? maxSize * DOCUMENTS_PRUNE_TO_RATIO : Infinity;
+    let removed = 0;
+    const oldestFirst = [...documents.values()].sort((a, b) => a.usedMs - b.usedMs);
+    for (const document of oldestFirst) {
+        if (document.usedMs >= oldestKeptMs && totalSize <= targetSize) {
+            break;
+        }
+        if (document.hash === keepHash || judgementOrderRenders.has(document.hash)) {
+            continue;
+        }
+        // The PDF goes first: without it the document is gone for the routes
+        document.names.sort((a, b) => (b === document.hash + '.pdf') - (a === document.hash + '.pdf'));
+        for (const name of document.names) {
+            cleanupFile(path.join(DOCUMENTS_DIR, name));
+        }
+        totalSize -= document.size;
+        removed++;
+    }
+    if (removed) {
+        console.log(`Pruned ${removed} documents from ${DOCUMENTS_DIR}`);
+    }
+    return removed;
+}
+
+/**
+ * Prune DOCUMENTS_DIR in the background, one pass at a time
+ * @param {string} keepHash - Hash of the document just stored
+ */
+function pruneDocuments(keepHash) {
+    if (documentsPrune) {
+        return;
+    }
+    documentsPrune = runDocumentsPrune(keepHash)
+        .catch((error) => console.error('Documents prune error:', error))
+        .finally(() => { documentsPrune = null; });
+}
+
+/**
+ * Render the judgement/order HTML of a stored document into the cache
+ * @param {string} hash - Document hash
+ * @returns {Promise<string>} - Path of the cached HTML; "<path>.gz" holds it gzipped
+ */
+async function runJudgementOrderRender(hash) {
+    const htmlPath = documentPath(hash, '.judgement-order.html');
+    const tmpPath = `${htmlPath}.${process.pid}.${Date.now()}.tmp`;
+    const pythonArgs = ['scripts/legal_document_extractor_simple.py', '--judgement-order', documentPath(hash, '.pdf')];
+    console.log(`Executing: python ${pythonArgs.join(' ')}`);
+    const python = spawn('python', pythonArgs, {
+        cwd: __dirname,
+        stdio: ['ignore', 'pipe', 'pipe']
+    });
+    let errorOutput = '';
+    python.stderr.on('data', (data) => {
+        errorOutput += data.toString();
+    });
+    const timeoutId = setTimeout(() => {
+        console.error(`Judgement order render timeout after ${JUDGEMENT_ORDER_TIMEOUT_MS/1000} seconds`);
+        python.kill('SIGTERM');
+    }, JUDGEMENT_ORDER_TIMEOUT_MS);
+    const exited = new Promise((resolve, reject) => {
+        python.on('close', (code) => {
+            clearTimeout(timeoutId);
+            if (code === 0) {
+                resolve();
+            } else {
+                reject(new Error(`Python script failed with code ${code}. Error: ${errorOutput}`));
+            }
+        });
+        python.on('error', (error) => {
+            clearTimeout(timeoutId);
+            reject(new Error(`Failed to start Python process: ${error.message}`));
+        });
+    });
+    try {
+        await Promise.all([pipeline(python.stdout, fs.createWriteStream(tmpPath)), exited]);
+        await pipeline(fs.createReadStream(tmpPath), zlib.createGzip({ level: 9 }), fs.createWriteStream(tmpPath + '.gz'));
+        // The .gz goes in last: its presence marks the cache entry complete
+        await fs.promises.rename(tmpPath, htmlPath);
+        await fs.promises.rename(tmpPath + '.gz', htmlPath + '.gz');
+        return htmlPath;
+    } finally {
+        cleanupFile(tmpPath);
+        cleanupFile(tmpPath + '.gz');
+    }
+}
+
+/**
+ * Cached judgement/order HTML of a stored document, rendering it on first use
+ * @param {string} hash - Document hash
+ * @returns {Promise<string>} - Path of the cached HTML
+ */
+function renderJudgementOrder(hash) {
+    const htmlPath = documentPath(hash, '.judgement-order.html');
+    if (fs.existsSync(htmlPath + '.gz')) {
+        return Promise.resolve(htmlPath);
+    }
+    let render = judgementOrderRenders.get(hash);
+    if (!render) {
+        render = runJudgementOrderRender(hash).finally(() => judgementOrderRenders.delete(hash));
+        judgementOrderRenders.set(hash, render);
+    }
+    return render;
+}
+
 /**
  * Extract legal metadata from PDF using Python script
  * @param {string} pdfPath - Absolute path to the PDF file
@@ -115,6 +331,8 @@ app.post('/extract-metadata', upload.single('pdf'), async (req, res) => {
     const originalName = req.file.originalname;
     const fileSize = req.file.size;
     const tesseractPath = req.query.tesseract_path || null;
+    // ?mode=metadata reads only the pages the metadata fields need
+    const metadataOnly = req.query.mode === 'metadata';
 
     console.log(`Processing PDF: ${originalName} (${(fileSize / 1024 / 1024).toFixed(2)}MB) at ${pdfPath}`);
 
@@ -122,16 +340,21 @@ app.post('/extract-metadata', upload.single('pdf'), async (req, res) => {
             const timeoutMs = fileSize > 5 * 1024 * 1024 ? 600000 : 300000; // 10 minutes for large files, 5 minutes for others
 
     try {
-        function extractLegalMetadata(pdfPath, tesseractPath = null, timeout = 120000) {
+        function extractLegalMetadata(pdfPath, tesseractPath = null, timeout = 120000, metadataOnly = false) {
             return new Promise((resolve, reject) => {
                 // Prepare Python command arguments
-                const pythonArgs = ['scripts/legal_document_extractor_simple.py', '--pdf', pdfPath];
+                // The judgement/order HTML is served by GET /documents/:hash/judgement-order
+                const pythonArgs = ['scripts/legal_document_extractor_simple.py', '--pdf', pdfPath, '--no-judgement-order'];
 
                 // Add tesseract path if provided
                 if (tesseractPath) {
                     pythonArgs.push('--tesseract-path', tesseractPath);
                 }
 
+                if (metadataOnly) {
+                    pythonArgs.push('--metadata-only');
+                }
+
                 console.log(`Executing: python ${pythonArgs.join(' ')} with ${timeout/1000}s timeout`);
 
                 // Spawn Python process
@@ -140,12 +363,14 @@ app.post('/extract-metadata', upload.single('pdf'), async (req, res) => {
                     stdio: ['pipe', 'pipe', 'pipe']
                 });
 
-                let result = '';
+                // Raw stdout chunks, decoded once on close: a multi-byte
+                // character can straddle two chunks
+                const resultChunks = [];
                 let errorOutput = '';
 
                 // Collect stdout data
                 python.stdout.on('data', (data) => {
-                    result += data.toString('utf8');
+                    resultChunks.push(data);
                 });
 
                 // Collect stderr data
@@ -160,7 +385,7 @@ app.post('/extract-metadata', upload.single('pdf'), async (req, res) => {
 
                     if (code === 0) {
                         try {
-                            const parsedResult = JSON.parse(result);
+                            const parsedResult = JSON.parse(Buffer.concat(resultChunks).toString('utf8'));
                             resolve(parsedResult);
                         } catch (parseError) {
                             console.error('JSON parsing error:', parseError);
@@ -190,8 +415,13 @@ app.post('/extract-metadata', upload.single('pdf'), async (req, res) => {
             });
         }
 
-        // Extract metadata using Python script with dynamic timeout
-        const extractedData = await extractLegalMetadata(pdfPath, tesseractPath, timeoutMs);
+        // Extract metadata using Python script with dynamic timeout, keeping
+        // the PDF for the judgement/order endpoint meanwhile
+        const [extractedData, documentHash] = await Promise.all([
+            extractLegalMetadata(pdfPath, tesseractPath, timeoutMs, metadataOnly),
+            storeDocument(pdfPath)
+        ]);
+        extractedData.judgementOrderUrl = judgementOrderUrl(documentHash);
 
         // Add file information to response
         const response = {
@@ -201,6 +431,7 @@ app.post('/extract-metadata', upload.single('pdf'), async (req, res) => {
                 originalName: originalName,
                 fileSize: fileSize,
                 fileSizeMB: (fileSize / 1024 / 1024).toFixed(2),
+                sha256: documentHash,
                 uploadTime: new Date().toISOString()
             },
             processingInfo: {
@@ -254,6 +485,7 @@ app.get('/health', (req, res) => {
         endpoints: {
             extract_metadata: '/extract-metadata',
             generate_docx: '/generate-docx',
+            judgement_order: '/documents/:hash/judgement-order',
             health: '/health'
         }
     });
@@ -269,7 +501,7 @@ app.get('/health', (req, res) => {
  * - Maintains document structure and formatting
  * - Preserves content integrity for legal documents
  * 
- * Returns the .docx file as a download.
+ * Streams the .docx file to the client as a download while it is generated.
  */
 //
 // POST /generate-docx
@@ -277,7 +509,10 @@ app.get('/health', (req, res) => {
 // Convert an uploaded PDF into a Word document using the enhanced
 // converter.  This endpoint accepts a single PDF file via
 // multipart/form-data (field name `pdf`) and returns a `.docx` file
-// download with the same basename.  It delegates the heavy lifting
+// download with the same basename.  The converter writes the archive
+// to its stdout, which is piped straight into the response; nothing is
+// written to disk.  Failures before the first byte are reported as
+// JSON, later ones abort the download.  It delegates the heavy lifting
 // to a Python script (`scripts/enhanced_pdf_to_docx.py`) which
 // implements advanced formatting preservation: removal of headers
 // like page numbers and watermarks, font and alignment preservation,
@@ -296,26 +531,23 @@ app.post('/generate-docx', upload.single('pdf'), async (req, res) => {
     const pdfPath = req.file.path;
     const originalName = req.file.originalname;
     const fileSize = req.file.size;
-    // Ensure the temporary directory for output exists
-    const tempDir = './temp';
-    if (!fs.existsSync(tempDir)) {
-        fs.mkdirSync(tempDir, { recursive: true });
-    }
-    // Construct the output DOCX path using the uploaded file's basename
+    // Name the download after the uploaded file's basename
     const docxFileName = path.basename(pdfPath, path.extname(pdfPath)) + '.docx';
-    const docxPath = path.join(tempDir, docxFileName);
     console.log(`Converting PDF: ${originalName} (${(fileSize / 1024 / 1024).toFixed(2)}MB) to DOCX`);
+    let python = null;
+    let headersSent = false;
     try {
         // Prepare the Python command arguments.  Use the enhanced
-        // converter script rather than the older v5 converter.
+        // converter script rather than the older v5 converter; "-" makes
+        // it write the DOCX archive to stdout.
         const pythonArgs = [
             'scripts/enhanced_pdf_to_docx.py',
             pdfPath,
-            docxPath
+            '-'
         ];
         console.log(`Executing: python ${pythonArgs.join(' ')}`);
         // Spawn the Python process in the current working directory
-        const python = spawn('python', pythonArgs, {
+        python = spawn('python', pythonArgs, {
             cwd: __dirname,
             stdio: ['ignore', 'pipe', 'pipe']
         });
@@ -325,6 +557,21 @@ app.post('/generate-docx', upload.single('pdf'), async (req, res) => {
             errorOutput += data.toString();
             console.error('Python stderr:', data.toString());
         });
+        // Send the headers with the first chunk of the archive, then pipe the rest
+        python.stdout.once('data', (chunk) => {
+            headersSent = true;
+            res.status(200);
+            res.attachment(docxFileName);
+            res.type('application/vnd.openxmlformats-officedocument.wordprocessingml.document');
+            res.write(chunk);
+            python.stdout.pipe(res, { end: false });
+        });
+        // Stop converting if the client goes away
+        res.on('close', () => {
+            if (python.exitCode === null) {
+                python.kill('SIGTERM');
+            }
+        });
         // Timeout based on file size: larger files get more time
         const timeoutMs = fileSize > 5 * 1024 * 1024 ? 600000 : 300000; // 10 minutes for large files, 5 minutes for others
         // Kill the Python process if it runs too long
@@ -332,7 +579,7 @@ app.post('/generate-docx', upload.single('pdf'), async (req, res) => {
             console.error(`DOCX conversion timeout after ${timeoutMs/1000} seconds`);
             python.kill('SIGTERM');
         }, timeoutMs);
-        // Await process exit
+        // Await process exit; stdout has been fully read by then
         await new Promise((resolve, reject) => {
             python.on('close', (code) => {
                 clearTimeout(timeoutId);
@@ -347,29 +594,19 @@ app.post('/generate-docx', upload.single('pdf'), async (req, res) => {
                 reject(new Error(`Failed to start Python process: ${error.message}`));
             });
         });
-        // Stream the generated DOCX back to the client.  Use res.download
-        // which sets appropriate headers and handles streaming.  Cleanup
-        // temp files after the download completes.
-        res.download(docxPath, docxFileName, (err) => {
-            // Always remove the uploaded PDF and generated DOCX
-            cleanupFile(pdfPath);
-            cleanupFile(docxPath);
-            if (err) {
-                console.error('Error sending .docx:', err);
-                res.status(500).json({
-                    success: false,
-                    error: 'Failed to send .docx file',
-                    message: err.message
-                });
-            } else {
-                console.log(`✅ Successfully converted ${originalName} to DOCX`);
-            }
-        });
+        if (!headersSent) {
+            throw new Error('Converter produced no output');
+        }
+        res.end();
+        console.log(`✅ Successfully converted ${originalName} to DOCX`);
     } catch (error) {
         console.error('DOCX generation error:', error);
-        // Clean up temp files on error
-        cleanupFile(pdfPath);
-        cleanupFile(docxPath);
+        if (headersSent) {
+            // Part of the archive is already on the wire; abort so the
+            // client sees a failed download rather than a truncated file
+            res.destroy(error);
+            return;
+        }
         res.status(500).json({
             success: false,
             error: error.message,
@@ -380,6 +617,69 @@ app.post('/generate-docx', upload.single('pdf'), async (req, res) => {
                 fileSizeMB: (fileSize / 1024 / 1024).toFixed(2)
             }
         });
+    } finally {
+        // Remove the uploaded PDF
+        cleanupFile(pdfPath);
+    }
+});
+
+//
+// GET /documents/:hash/judgement-order
+//
+// The judgement/order section of a PDF sent to /extract-metadata, as the
+// HTML that used to be inlined in `metadata.judgementOrder`; the metadata
+// response links here through `metadata.judgementOrderUrl`.  The HTML is
+// rendered on the first request and cached.  Responses are gzipped when the
+// client accepts it and carry a strong ETag, so If-None-Match revalidation
+// and byte ranges (If-Range included) work against the cached file.
+//
+app.get('/documents/:hash/judgement-order', async (req, res) => {
+    const hash = req.params.hash;
+    if (!DOCUMENT_HASH_RE.test(hash)) {
+        return res.status(400).json({
+            success: false,
+            error: 'Invalid document hash',
+            message: 'Use the judgementOrderUrl returned by /extract-metadata'
+        });
+    }
+    if (!fs.existsSync(documentPath(hash, '.pdf'))) {
+        return res.status(404).json({
+            success: false,
+            error: 'Document not found',
+            message: 'Upload the PDF to /extract-metadata first'
+        });
+    }
+    try {
+        await touchDocument(hash);
+        const htmlPath = await renderJudgementOrder(hash);
+        const gzip = req.acceptsEncodings('gzip', 'identity') === 'gzip';
+        const filePath = gzip ? htmlPath + '.gz' : htmlPath;
+        // Cache files are only ever replaced whole, so size and mtime
+        // identify their bytes
+        const stat = await fs.promises.stat(filePath);
+        res.vary('Accept-Encoding');
+        res.type('html');
+        res.set('Cache-Control', 'no-cache');
+        res.set('ETag', `"${hash.slice(0, 16)}-${stat.size.toString(16)}-${Math.floor(stat.mtimeMs).toString(16)}${gzip ? '-gz' : ''}"`);
+        if (gzip) {
+            res.set('Content-Encoding', 'gzip');
+        }
+        // sendFile answers If-None-Match with 304 and Range with 206
+        res.sendFile(filePath, { cacheControl: false }, (error) => {
+            if (error && !res.headersSent) {
+                res.status(error.status || 500).json({
+                    success: false,
+                    error: error.message
+                });
+            }
+        });
+    } catch (error) {
+        console.error('Judgement order error:', error);
+        res.status(500).json({
+            success: false,
+            error: error.message,
+            message: 'Failed to render the judgement/order HTML'
+        });
     }
 });
 
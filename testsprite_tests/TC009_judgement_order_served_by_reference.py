@@ -0,0 +1,46 @@
+import requests
+import os
+
+BASE_URL = "http://localhost:3000"
+ENDPOINT = "/extract-metadata"
+TIMEOUT = 30
+TEST_FILE_PATH = "testsprite_tests/test_files/anita_yuvraj_test.pdf"
+
+def test_judgement_order_served_by_reference():
+    try:
+        with open(TEST_FILE_PATH, "rb") as pdf_file:
+            files = {"pdf": (os.path.basename(TEST_FILE_PATH), pdf_file, "application/pdf")}
+            response = requests.post(BASE_URL + ENDPOINT, files=files, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+        metadata = response.json()["metadata"]
+        # The HTML is no longer inlined; the metadata links to it
+        assert metadata.get("judgementOrder") == "", "judgementOrder should be empty in the metadata response"
+        url = metadata.get("judgementOrderUrl")
+        assert isinstance(url, str) and url.startswith("/documents/"), f"Unexpected judgementOrderUrl: {url}"
+
+        # Rendered on demand and served gzipped
+        html_response = requests.get(BASE_URL + url, headers={"Accept-Encoding": "gzip"}, timeout=TIMEOUT)
+        assert html_response.status_code == 200, f"Expected status code 200, got {html_response.status_code}"
+        assert html_response.headers.get("Content-Type", "").startswith("text/html"), "Judgement order is not HTML"
+        assert html_response.headers.get("Content-Encoding") == "gzip", "Judgement order was not gzipped"
+        assert "<div" in html_response.text, "Judgement order HTML is empty"
+        etag = html_response.headers.get("ETag")
+        assert etag, "ETag header missing"
+
+        # Revalidation
+        not_modified = requests.get(BASE_URL + url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}, timeout=TIMEOUT)
+        assert not_modified.status_code == 304, f"Expected status code 304, got {not_modified.status_code}"
+
+        # Byte ranges of the uncompressed HTML
+        partial = requests.get(BASE_URL + url, headers={"Accept-Encoding": "identity", "Range": "bytes=0-99"}, timeout=TIMEOUT)
+        assert partial.status_code == 206, f"Expected status code 206, got {partial.status_code}"
+        assert len(partial.content) == 100, f"Expected 100 bytes, got {len(partial.content)}"
+        assert html_response.text.encode("utf-8").startswith(partial.content), "Range does not match the document start"
+
+        # Unknown documents
+        missing = requests.get(BASE_URL + "/documents/" + "0" * 64 + "/judgement-order", timeout=TIMEOUT)
+        assert missing.status_code == 404, f"Expected status code 404, got {missing.status_code}"
+    except requests.exceptions.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+test_judgement_order_served_by_reference()